@@ -0,0 +1,77 @@
+import os
+import threading
+import pygame
+from resources import SOUND_EXTENSIONS, scan_assets
+
+MUSIC = ('main_menu', 'go')
+SFX_CHANNELS = 8
+
+
+class Audio:
+    def __init__(self, music_volume: float = 1.0, sfx_volume: float = 1.0) -> None:
+        self.music_volume = music_volume
+        self.sfx_volume = sfx_volume
+        self.music: dict[str, str] = {}
+        self.sounds: dict[str, pygame.mixer.Sound] = {}
+        self.channels: list[pygame.mixer.Channel] = []
+        self.loader: threading.Thread | None = None
+
+    def load(self) -> None:
+        if pygame.mixer.get_init():
+            pygame.mixer.set_num_channels(SFX_CHANNELS)
+            self.channels = [pygame.mixer.Channel(i) for i in range(SFX_CHANNELS)]
+        sfx = []
+        for _, path in scan_assets(SOUND_EXTENSIONS):
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name in MUSIC:
+                self.music[name] = path
+            else:
+                sfx.append((name, path))
+        if self.channels:
+            self.loader = threading.Thread(target=self.load_sfx, args=(sfx,), daemon=True)
+            self.loader.start()
+
+    def load_sfx(self, sfx: list[tuple[str, str]]) -> None:
+        for name, path in sfx:
+            try:
+                self.sounds[name] = pygame.mixer.Sound(path)
+            except pygame.error:
+                pass
+
+    def wait(self) -> None:
+        if self.loader is not None:
+            self.loader.join()
+
+    def play_music(self, name: str, loops: int = -1) -> None:
+        if name not in self.music or not self.channels:
+            return
+        try:
+            pygame.mixer.music.load(self.music[name])
+        except pygame.error:
+            return
+        pygame.mixer.music.set_volume(self.music_volume)
+        pygame.mixer.music.play(loops)
+
+    def play(self, name: str) -> None:
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        channel = pygame.mixer.find_channel(True)
+        if channel is not None:
+            channel.play(sound)
+            channel.set_volume(self.sfx_volume)
+
+    def stop(self) -> None:
+        if self.channels:
+            pygame.mixer.music.stop()
+            pygame.mixer.stop()
+
+    def set_music_volume(self, volume: float) -> None:
+        self.music_volume = volume
+        if self.channels:
+            pygame.mixer.music.set_volume(volume)
+
+    def set_sfx_volume(self, volume: float) -> None:
+        self.sfx_volume = volume
+        for channel in self.channels:
+            channel.set_volume(volume)
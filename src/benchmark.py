@@ -0,0 +1,218 @@
+import argparse
+import gc
+import json
+import os
+import random
+import runpy
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+GAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game.py')
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+SCENARIOS = ('main_menu', 'gameplay', 'threaded', 'low_res', 'stress', 'rush_hour', 'leaderboard', 'collision')
+PLAYING = ('gameplay', 'threaded', 'low_res', 'stress', 'rush_hour')
+# metric -> True when a higher value is better
+METRICS = {'fps': True, 'p99_ms': False, 'ttff_ms': False}
+
+
+class FixedClock:
+    def __init__(self, fps: int) -> None:
+        self.fps = fps
+
+    def tick(self, framerate: int = 0) -> int:
+        return round(1000 / self.fps)
+
+    def get_fps(self) -> float:
+        return float(self.fps)
+
+
+def press(pygame, key: int) -> None:
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode='', mod=0, scancode=0))
+
+
+def run_scenario(name: str, frames: int) -> dict[str, float]:
+    started = time.perf_counter()
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    sys.path.insert(0, os.path.dirname(GAME))
+    import config
+    if name == 'rush_hour':
+        config.RUSH_HOUR = True
+    elif name == 'threaded':
+        config.THREADED_SIMULATION = True
+    elif name == 'low_res':
+        config.LOW_RES = True
+        config.WORLD_SCALE = config.MULTIPLIER
+    g = runpy.run_path(GAME, run_name='benchmark')['step_frame'].__globals__
+    pygame = g['pygame']
+    if name != 'threaded':
+        g['clock'] = FixedClock(g['FPS'])
+    g['intro']()
+    g['step_frame']()
+    ttff = g['first_frame'] - started
+
+    if name == 'leaderboard':
+        g['high_scores'].submit_many((f'player{i % 5000}', i * 37 % 100000) for i in range(100000))
+
+    setup = time.perf_counter()
+    if name == 'main_menu':
+        g['main_menu']()
+    elif name in PLAYING:
+        g['sim_profiler'].enabled = True
+        g['game']()
+        g['sim'].lives = 10 ** 9
+    elif name == 'leaderboard':
+        g['leaderboard']()
+    setup = time.perf_counter() - setup
+
+    times = []
+    gc.collect()
+    collections = sum(stat['collections'] for stat in gc.get_stats())
+    blocks = sys.getallocatedblocks()
+    for frame in range(frames):
+        if name in PLAYING:
+            sim = g['sim']
+            if frame % 3 == 0:
+                press(pygame, g['settings']['action_keybind'])
+            if name == 'stress':
+                width = g['WIDTH']
+                while len(sim.collision) < 300:
+                    template = sim.random.choice(sim.obstacles + sim.recycle_obs)
+                    sim.add(sim.pool.acquire((sim.random.uniform(0, width * 2), template.pos.y),
+                                             template.image, template.type))
+        start = time.perf_counter()
+        g['step_frame']()
+        times.append(time.perf_counter() - start)
+        if name == 'threaded' and frame % 60 == 59:
+            # a presentation hitch, the simulation thread should keep ticking through it
+            time.sleep(0.1)
+    collections = sum(stat['collections'] for stat in gc.get_stats()) - collections
+    blocks = sys.getallocatedblocks() - blocks
+    sim_summary = g['sim_profiler'].summary()
+    summary = g['profiler'].summary()
+    g['stop_runner']()
+    pygame.quit()
+
+    times.sort()
+    result = {
+        'fps': frames / sum(times),
+        'p50_ms': statistics.median(times) * 1000,
+        'p99_ms': times[min(len(times) - 1, round(len(times) * 0.99))] * 1000,
+        'ttff_ms': ttff * 1000,
+        'setup_ms': setup * 1000,
+        'gc_per_1000_frames': collections / frames * 1000,
+        'net_blocks_per_frame': blocks / frames,
+    }
+    if 'input_p50' in summary:
+        result['input_p50_ms'] = summary['input_p50']
+        result['input_p99_ms'] = summary['input_p99']
+    if 'work_ms' in sim_summary:
+        result['sim_ms'] = sim_summary['work_ms']
+        result['sim_tick_p99_ms'] = sim_summary['p99']
+    return result
+
+
+def run_collision(queries: int) -> dict[str, float]:
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    sys.path.insert(0, os.path.dirname(GAME))
+    import pygame
+    from game import Obstacle
+    from resources import Assets, load_assets, build_obstacles, create_ground, create_player
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    assets = Assets()
+    load_assets(assets)
+    obstacles, recycle_obs = build_obstacles(assets)
+    player = create_player(assets, create_ground())
+    rng = random.Random(0)
+    rect = player.get_world_hitbox()
+    placed = []
+    for _ in range(queries):
+        template = rng.choice(obstacles + recycle_obs)
+        w, h = template.hitbox.size
+        placed.append(Obstacle((rng.uniform(rect.left - w, rect.right), rng.uniform(rect.top - h, rect.bottom)),
+                               template.image, template.type))
+
+    start = time.perf_counter()
+    rect_hits = sum(obj.get_world_hitbox().colliderect(player.get_world_hitbox()) for obj in placed)
+    rect_time = time.perf_counter() - start
+    start = time.perf_counter()
+    mask_hits = sum(obj.collides_with(player) for obj in placed)
+    mask_time = time.perf_counter() - start
+    pygame.quit()
+
+    return {
+        'rect_hits': rect_hits,
+        'mask_hits': mask_hits,
+        'false_positive_rate': 1 - mask_hits / rect_hits,
+        'rect_us': rect_time / queries * 1e6,
+        'mask_us': mask_time / queries * 1e6,
+    }
+
+
+def spawn(name: str, frames: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as cwd:
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name, '--frames', str(frames)],
+                                cwd=cwd, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def compare(results: dict, baseline: dict, margin: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        for metric, higher_is_better in METRICS.items():
+            if name not in baseline or metric not in baseline[name]:
+                continue
+            old, new = baseline[name][metric], result[metric]
+            change = (old - new) / old if higher_is_better else (new - old) / old
+            if change > margin:
+                regressions.append(f'{name} {metric}: {old:.2f} -> {new:.2f} ({change:+.0%})')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ChairRecycler scenes under the SDL dummy drivers.')
+    parser.add_argument('scenarios', nargs='*', metavar='scenario', help=f'any of {", ".join(SCENARIOS)}')
+    parser.add_argument('-f', '--frames', type=int, default=1000)
+    parser.add_argument('-b', '--baseline', default=BASELINE)
+    parser.add_argument('-m', '--margin', type=float, default=0.2, help='allowed regression, 0.2 = 20%%')
+    parser.add_argument('--save', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_collision(args.frames * 100) if args.child == 'collision'
+                         else run_scenario(args.child, args.frames)))
+        return
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f'unknown scenario {name}')
+
+    results = {}
+    for name in args.scenarios or SCENARIOS:
+        results[name] = result = spawn(name, args.frames)
+        print(f'{name:12} ' + '  '.join(f'{metric} {value:.2f}' for metric, value in result.items()))
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'Saved baseline to {args.baseline}')
+        return
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except (FileNotFoundError, OSError, ValueError):
+        print('No baseline to compare against, run with --save to create one')
+        return
+    regressions = compare(results, baseline, args.margin)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+WIDTH, HEIGHT = RESOLUTION = 1280, 720
+FPS = 60
+MULTIPLIER = 4
+DIRTY_RENDERING = True
+LOW_RES = False
+WORLD_SCALE = MULTIPLIER if LOW_RES else 1
+PROFILER = False
+PROFILER_OUTPUT: str | None = None
+RECORD_REPLAYS = True
+REPLAY_DIR = 'replays'
+RUSH_HOUR = False
+RUSH_HOUR_RATE = 120
+RUSH_HOUR_SECONDS = 90
+DIFFICULTY = False
+THREADED_SIMULATION = False
+NET_HOST = '127.0.0.1'
+NET_PORT = 47800
+NET_SNAPSHOT_RATE = 30
+NET_INTERPOLATION = 0.1
+NET_TIMEOUT = 5
+
+rates = {
+    'obstacle': 2,
+    'recycle': 2
+}
+
+difficulty_rates = {
+    'obstacle': ((0, 2), (60, 1.5), (180, 1), (300, 0.75)),
+    'recycle': ((0, 2), (120, 1.5), (300, 1))
+}
+
+max_values = {
+    'chair': 8,
+    'bottle': 8
+}
+
+scores = {
+    'table': 100,
+    'bottle': 25,
+    'missed_bottle': -150
+}
@@ -1,29 +1,35 @@
 import json
 import os
-import random
+import sys
+import time
+from typing import Callable, Generator
 import pygame
-from game import GameObject, Player, Obstacle
-from gui import Button, GuiObject
+from audio import Audio
+from config import WIDTH, HEIGHT, RESOLUTION, FPS, MULTIPLIER, DIRTY_RENDERING, LOW_RES, WORLD_SCALE, PROFILER, \
+    PROFILER_OUTPUT, RECORD_REPLAYS, REPLAY_DIR, RUSH_HOUR, DIFFICULTY, THREADED_SIMULATION, NET_HOST, NET_PORT, \
+    rates, difficulty_rates, max_values
+from game import GameObject, Obstacle, Player, Rate, world_size, Registry, Replay, ReplayPlayer, RushHourSimulation, \
+    Simulation, SimulationThread, Snapshot, SnapshotView
+from game.replay import ACTION, PAUSE, UNPAUSE, NAME, END
+from game.store import TYPES
+from gui import Button, GuiObject, Hud, Label, SceneCache, Widgets, set_cursor, text_cache
+from leaderboard import Leaderboard
+from net import Client, SpriteTable, connect
+from net.protocol import SEATS, OBSTACLES
+from profiler import Profiler, ProfilerOverlay
+from render import DirtyRenderer, LowResRenderer, ENTITIES, HELD, GUI, OVERLAY
+from resources import Assets, load_assets, load_font, build_obstacles, create_ground, create_player
+
+startup = time.perf_counter()
+first_frame = 0.0
 
 ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz1234567890!@#$%^&*()-=_+/,.`~;\\ '
-WIDTH, HEIGHT = RESOLUTION = 1280, 720
-FPS = 60
-MULTIPLIER = 4
+LEADERBOARD_PAGE = 10
+REPLAY_SEEK = 10 * FPS
+REPLAY_SPEEDS = (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
 
-high_score = 0
-try:
-    with open('highscore') as f:
-        high_scores: list = json.load(f)
-        f = True
-        for name, sc in high_scores:
-            sc = int(sc)
-            if f:
-                f = False
-                high_score = sc
-            if sc > high_score:
-                high_score = sc
-except (FileNotFoundError, OSError) as e:
-    high_scores = []
+high_scores = Leaderboard()
+high_score = high_scores.high_score or 0
 
 try:
     with open('settings') as f:
@@ -36,89 +42,62 @@ except (FileNotFoundError, OSError, ValueError) as e:
     }
 
 
-def sort_leaderboard():
-    global high_scores
-    high_scores.sort(key=lambda x: int(x[1]), reverse=True)
-    high_scores = high_scores[:10]
-
-
-def to_screen_scale(surface: pygame.Surface):
-    return pygame.transform.scale(surface, (surface.get_width() * MULTIPLIER, surface.get_height() * MULTIPLIER))
-
-
-rates = {
-    'obstacle': 2,
-    'recycle': 2
-}
-
-max_values = {
-    'chair': 8,
-    'bottle': 8
-}
-
-pygame.init()
+pygame.display.init()
+pygame.font.init()
 window = pygame.display.set_mode(RESOLUTION, vsync=1)
+renderer = LowResRenderer(window) if LOW_RES else DirtyRenderer(window)
 clock = pygame.time.Clock()
 running = True
 
-game_font_big = pygame.font.SysFont('Arial', 100)
-game_font_medium = pygame.font.SysFont('Arial', 50)
-game_font_small = pygame.font.SysFont('Arial', 25)
+game_font_medium = load_font('Arial', 50)
+game_font_small = load_font('Arial', 25)
+
+profiler = Profiler(PROFILER, PROFILER_OUTPUT)
+profiler_overlay = ProfilerOverlay(profiler, game_font_small, (WIDTH, HEIGHT), 'bottomright')
+renderer.profiler = profiler
+sim_profiler = Profiler(PROFILER)
+sim_overlay = ProfilerOverlay(sim_profiler, game_font_small, (0, HEIGHT), 'bottomleft', title='sim')
 
-high_score_text: pygame.Surface | None = None
 hover: GuiObject | None = None
 scene: str | None = None
 player: Player | None = None
-bg_color: pygame.Color | None = None
-game_objects: dict[str, GameObject] = {}
-gui_objects: dict[str, GuiObject] = {}
-
-sounds: dict[str, pygame.mixer.Sound] = {}
-assets: dict[str, pygame.Surface] = {}
-
-
-def load_assets(prefix: str = '', *paths: list[str]):
-    global assets, sounds
-    if prefix != '':
-        prefix += '_'
-    for file in os.scandir(os.path.join(os.path.dirname(__file__), 'assets', *paths)):
-        name = file.name.split('.')[0]
-        if file.is_dir():
-            load_assets(f'{prefix}{name}', *paths, name)
-            continue
-        try:
-            asset = to_screen_scale(pygame.image.load(file.path).convert_alpha())
-            assets[f'{prefix}{name}'] = asset
-            asset = pygame.transform.flip(asset, True, False)
-            assets[f'{prefix}{name}2'] = asset
-        except pygame.error:
-            try:
-                sounds[name] = pygame.mixer.Sound(file.path)
-            except pygame.error:
-                pass
-
-
-load_assets()
-
-obstacles: tuple[Obstacle, ...] = (
-    Obstacle((WIDTH + Obstacle.velocity, HEIGHT - HEIGHT / MULTIPLIER - assets['obstacle_chair_side'].get_height()),
-             assets['obstacle_chair_side'], 'chair'),
-    Obstacle((WIDTH + Obstacle.velocity, HEIGHT - HEIGHT / MULTIPLIER - assets['obstacle_chair_side2'].get_height()),
-             assets['obstacle_chair_side2'], 'chair'),
-    Obstacle((WIDTH + Obstacle.velocity, HEIGHT - HEIGHT / MULTIPLIER - assets['obstacle_table_side'].get_height()),
-             assets['obstacle_table_side'], 'table'),
-    Obstacle((WIDTH + Obstacle.velocity, HEIGHT - HEIGHT / MULTIPLIER - assets['obstacle_table_side2'].get_height()),
-             assets['obstacle_table_side2'], 'table'),
-)
-recycle_obs: tuple[Obstacle, ...] = (
-    Obstacle(
-        (WIDTH + Obstacle.velocity * 2 * 100, HEIGHT - HEIGHT / MULTIPLIER - assets['bottle_bottle'].get_height()),
-        assets['bottle_bottle'], 'bottle'),
-    Obstacle((WIDTH + Obstacle.velocity * 2 * 100, HEIGHT - HEIGHT / MULTIPLIER - assets['bottle_can'].get_height()),
-             assets['bottle_can'], 'bottle'),
-    Obstacle((WIDTH + Obstacle.velocity * 2 * 100, HEIGHT - HEIGHT / MULTIPLIER - assets['recycle_bin'].get_height()),
-             assets['recycle_bin'], 'bin')
-)
+sim: Simulation | None = None
+recorder: Replay | None = None
+playback: ReplayPlayer | None = None
+runner: SimulationThread | None = None
+view = SnapshotView()
+client: Client | None = None
+net_objects: dict[int | tuple[int, str], GameObject] = {}
+replay_speed = 1
+backdrop: pygame.Surface | None = None
+backdrops: dict[tuple[tuple[int, int, int], bool], pygame.Surface] = {}
+game_objects = Registry()
+gui_objects = Widgets()
+scenes = SceneCache()
+leaderboard_pages: dict[int, list[tuple[str, int]]] = {}
+
+assets = Assets()
+audio = Audio(settings['music_volume'], settings['sfx_volume'])
+obstacles: tuple[Obstacle, ...] = ()
+recycle_obs: tuple[Obstacle, ...] = ()
+chair_stack: GameObject | None = None
+chair_stacks: dict[int, pygame.Surface] = {}
+sprites: SpriteTable | None = None
+
+
+def load_deferred():
+    global obstacles, recycle_obs, chair_stack, sprites
+    if assets:
+        return
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pass
+    load_assets(assets)
+    audio.load()
+    obstacles, recycle_obs = build_obstacles(assets)
+    chair_stack = GameObject((0, 0), assets['obstacle_chair_side2'])
+    sprites = SpriteTable(assets)
 
 
 def stop_game():
@@ -126,184 +105,420 @@ def stop_game():
     running = False
 
 
+def get_chair_stack(chairs: int) -> pygame.Surface:
+    if chairs not in chair_stacks:
+        chair = assets['obstacle_chair_side2']
+        step = 4 * MULTIPLIER // WORLD_SCALE
+        stack = pygame.Surface((chair.get_width(), chair.get_height() + step * (chairs - 1)), pygame.SRCALPHA)
+        for i in range(1, chairs):
+            stack.blit(chair, (0, step * (chairs - 1 - i)))
+        chair_stacks[chairs] = stack
+    return chair_stacks[chairs]
+
+
+def new_simulation(seed: int | None = None, sim_rates: dict[str, Rate] = difficulty_rates if DIFFICULTY else rates,
+                   sim_max_values: dict[str, int] = max_values,
+                   mode: str = 'rush_hour' if RUSH_HOUR else 'normal',
+                   sim_scores: dict[str, int] | None = None) -> Simulation:
+    global game_objects, player, sim
+    game_objects = Registry()
+    player = create_player(assets, create_ground())
+    sim = (RushHourSimulation if mode == 'rush_hour' else Simulation)(
+        player, obstacles, recycle_obs, assets['obstacle_chair_side2'], sim_rates, sim_max_values, game_objects, seed,
+        sim_scores)
+    sim.profiler = profiler
+    renderer.invalidate()
+    return sim
+
+
+def sim_call(function: Callable[[], None]) -> None:
+    if runner is not None:
+        runner.call(function)
+    else:
+        function()
+
+
+def sim_state() -> Simulation | Snapshot:
+    return runner.latest if runner is not None else sim
+
+
+def stop_runner():
+    global runner
+    if runner is None:
+        return
+    runner.stop()
+    runner = None
+    view.clear()
+    renderer.invalidate()
+
+
+def save_replay():
+    global recorder
+    if recorder is None:
+        return
+    if not recorder.events or recorder.events[-1][1] != END:
+        recorder.record(sim.frame, END)
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    recorder.save(os.path.join(REPLAY_DIR, time.strftime('%Y%m%d-%H%M%S') + f'-{sim.seed:x}.rpl'))
+    recorder = None
+
+
+def get_backdrop(color: tuple[int, int, int], ground: bool = False) -> pygame.Surface:
+    if (color, ground) not in backdrops:
+        backdrops[color, ground] = renderer.compose(color, (create_ground(),) if ground else ())
+    return backdrops[color, ground]
+
+
 def unload_scene():
-    global game_objects, gui_objects, hover
+    global game_objects, gui_objects, hover, sim, playback, client
+    stop_runner()
+    save_replay()
     hover = None
-    game_objects = {}
-    gui_objects = {}
-    pygame.mixer.stop()
-    pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+    sim = None
+    playback = None
+    if client is not None:
+        client.close()
+        client = None
+    net_objects.clear()
+    profiler.latency.clear()
+    game_objects = Registry()
+    gui_objects = Widgets()
+    audio.stop()
+    set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+
+
+def build_intro() -> Widgets:
+    widgets = Widgets()
+    font_big = load_font('Arial', 100, True)
+    font_small = load_font('Arial', 50)
+    text = font_big.render('AharaiTech Tel-Aviv', True, (255, 255, 255))
+    widgets['aharaitech'] = GuiObject((WIDTH / 2 - text.get_width() / 2, HEIGHT / 2 - text.get_height() / 2), text)
+    text2 = font_small.render('Presents...', True, (255, 255, 255))
+    widgets['presents'] = GuiObject((WIDTH / 2 + text2.get_width(), HEIGHT / 2 + text.get_height() / 3), text2)
+    return widgets
 
 
 def intro():
-    global scene, bg_color, gui_objects
+    global scene, backdrop, gui_objects
     unload_scene()
     scene = 'intro'
-    bg_color = pygame.Color(0, 0, 0)
-    font_big = pygame.font.SysFont('Arial', 100, True)
-    font_small = pygame.font.SysFont('Arial', 50)
-    text = font_big.render('AharaiTech Tel-Aviv', True, (255, 255, 255))
-    gui_objects['aharaitech'] = GuiObject((WIDTH / 2 - text.get_width() / 2, HEIGHT / 2 - text.get_height() / 2), text)
-    text2 = font_small.render('Presents...', True, (255, 255, 255))
-    gui_objects['presents'] = GuiObject((WIDTH / 2 + text2.get_width(), HEIGHT / 2 + text.get_height() / 3), text2)
+    backdrop = get_backdrop((0, 0, 0))
+    gui_objects = scenes.get('intro', build_intro)
     gui_objects['aharaitech'].image.set_alpha(0)
-
-
-def main_menu():
-    global scene, bg_color, gui_objects
-    unload_scene()
-    scene = 'main_menu'
-    bg_color = pygame.Color(100, 100, 100)
-    gui_objects['logo'] = GuiObject((WIDTH / 2 - assets['logo'].get_width() / 2,
-                                     HEIGHT / 3 - assets['logo'].get_height() / 2),
-                                    assets['logo'])
-    gui_objects['play'] = Button(
+    scenes.preload('main_menu', build_main_menu)
+    scenes.preload('settings', build_settings)
+    scenes.preload(('leaderboard', 0), lambda: build_leaderboard(0))
+    scenes.preload('lose', build_lose)
+
+
+def build_main_menu() -> Widgets:
+    widgets = Widgets()
+    widgets['logo'] = GuiObject((WIDTH / 2 - assets['logo'].get_width() / 2,
+                                 HEIGHT / 3 - assets['logo'].get_height() / 2),
+                                assets['logo'])
+    widgets['play'] = Button(
         (WIDTH / 2 - assets['button_play'].get_width() / 2, HEIGHT / 2),
         assets['button_play'],
         assets['button_play_pressed']
     )
-    gui_objects['info'] = Button(
-        (gui_objects['play'].pos.x, HEIGHT / 2 + gui_objects['play'].image.get_height() + 10),
+    widgets['info'] = Button(
+        (widgets['play'].pos.x, HEIGHT / 2 + widgets['play'].image.get_height() + 10),
         assets['button_info'],
         assets['button_info_pressed']
     )
-    gui_objects['options'] = Button(
-        (gui_objects['play'].pos.x
-         + gui_objects['play'].image.get_width() / 2
+    widgets['options'] = Button(
+        (widgets['play'].pos.x
+         + widgets['play'].image.get_width() / 2
          - assets['button_options'].get_width() / 2,
-         HEIGHT / 2 + gui_objects['play'].image.get_height() + 10),
+         HEIGHT / 2 + widgets['play'].image.get_height() + 10),
         assets['button_options'],
         assets['button_options_pressed']
     )
-    gui_objects['exit'] = Button(
-        (gui_objects['play'].pos.x + gui_objects['play'].image.get_width() - assets['button_exit'].get_width(),
-         HEIGHT / 2 + gui_objects['play'].image.get_height() + 10),
+    widgets['exit'] = Button(
+        (widgets['play'].pos.x + widgets['play'].image.get_width() - assets['button_exit'].get_width(),
+         HEIGHT / 2 + widgets['play'].image.get_height() + 10),
         assets['button_exit'],
         assets['button_exit_pressed']
     )
-    gui_objects['play'].after_click = game
-    gui_objects['info'].after_click = leaderboard
-    gui_objects['options'].after_click = settings_screen
-    gui_objects['exit'].after_click = stop_game
-    grey_box = pygame.Surface((WIDTH, HEIGHT / MULTIPLIER))
-    grey_box.fill((125, 125, 125))
-    game_objects['ground'] = GameObject((0, HEIGHT - HEIGHT / MULTIPLIER), grey_box)
+    widgets['multiplayer'] = Button(
+        (widgets['play'].pos.x, HEIGHT / 2 + (widgets['play'].image.get_height() + 10) * 2),
+        assets['button_multiplayer'],
+        assets['button_multiplayer_pressed']
+    )
+    widgets['play'].after_click = game
+    widgets['multiplayer'].after_click = multiplayer
+    widgets['info'].after_click = leaderboard
+    widgets['options'].after_click = settings_screen
+    widgets['exit'].after_click = stop_game
+    return widgets
+
+
+def main_menu():
+    global scene, backdrop, gui_objects
+    unload_scene()
+    scene = 'main_menu'
+    backdrop = get_backdrop((100, 100, 100), True)
+    gui_objects = scenes.get('main_menu', build_main_menu)
     game_objects['player'] = GameObject((WIDTH / MULTIPLIER,
-                                         game_objects['ground'].pos.y - assets['player_front'].get_height()),
+                                         create_ground().pos.y - world_size(assets['player_front'])[1]),
                                         assets['player_front'])
-    sounds['main_menu'].set_volume(settings['music_volume'])
-    sounds['main_menu'].play(-1)
+    audio.play_music('main_menu')
 
 
-def game():
-    global scene, bg_color, gui_objects, game_objects, player, game_started, score, high_score, high_score_text, \
-        bottles, chairs, lives, bottles_recycled, chairs_flipped, player_name
+def game(threaded: bool = THREADED_SIMULATION):
+    global scene, backdrop, gui_objects, accumulator, player_name, recorder, runner
     player_name = ''
-    bottles_recycled = 0
-    chairs_flipped = 0
-    high_score_text = game_font_small.render(f'High Score: {str(round(high_score))}', True, (255, 255, 255))
-    chairs = 0
-    bottles = 0
-    lives = 3
-    score = 0
-    game_started = pygame.time.get_ticks() - 1000
+    accumulator = 0
     unload_scene()
     scene = 'game'
-    bg_color = pygame.Color(100, 100, 100)
-    grey_box = pygame.Surface((WIDTH, HEIGHT / MULTIPLIER))
-    grey_box.fill((125, 125, 125))
-    game_objects['ground'] = GameObject((0, HEIGHT - HEIGHT / MULTIPLIER), grey_box)
-    player = game_objects['player'] = Player(WIDTH / MULTIPLIER, game_objects['ground'].pos.y, assets['player_side'],
-                                             assets['player_holding'])
+    backdrop = get_backdrop((100, 100, 100), True)
+    new_simulation()
+    if RECORD_REPLAYS:
+        recorder = Replay.of(sim)
+    if threaded and not isinstance(sim, RushHourSimulation):
+        sim.profiler = sim_profiler
+        runner = SimulationThread(sim, sim_profiler)
+        runner.start()
     gui_objects['pause'] = Button((WIDTH / 2 - assets['button_pause'].get_width() / 2, 10),
                                   assets['button_pause'], assets['button_pause_pressed'])
     gui_objects['pause'].after_click = pause
-    sounds['go'].set_volume(settings['music_volume'])
-    sounds['go'].play(-1)
+    score = Label((WIDTH / 2, HEIGHT / 7 + game_font_small.get_height()), game_font_medium,
+                  lambda: round(sim_state().score), 'Score: {}', anchor='midtop')
+    gui_objects['hud'] = Hud({
+        'bottles': Label((WIDTH / 2 - 10, HEIGHT / 7), game_font_small, lambda: sim_state().bottles, 'Bottles: {}',
+                         anchor='topright'),
+        'chairs': Label((WIDTH / 2 + 10, HEIGHT / 7), game_font_small, lambda: sim_state().chairs, 'Chairs: {}'),
+        'score': score,
+        'high_score': Label((WIDTH / 2, score.pos.y + game_font_medium.get_height()), game_font_small,
+                            lambda: round(high_score), 'High Score: {}', anchor='midtop'),
+        'lives': Label(player.pos, game_font_small, lambda: sim_state().lives, 'Lives: {}', anchor='bottomleft')
+    })
+    gui_objects.build()
+    audio.play_music('go')
+
+
+def watch_replay(path: str):
+    global scene, gui_objects, playback, recorder, replay_speed
+    game(False)
+    recorder = None
+    scene = 'replay'
+    replay_speed = 1
+    playback = ReplayPlayer(Replay.load(path), lambda r: new_simulation(r.seed, r.rates, r.max_values, r.mode,
+                                                                              r.scores))
+    del gui_objects['pause']
+    gui_objects['speed'] = Label((WIDTH / 2, 10), game_font_medium, lambda: replay_speed, 'Replay {}x',
+                                 anchor='midtop')
+    gui_objects.build()
+
+
+def seek_replay(frames: int):
+    global accumulator
+    accumulator = 0
+    playback.seek(max(0, sim.frame + frames))
 
 
 def pause():
-    global game_objects, scene
+    global scene
+    if runner is not None:
+        runner.pause()
+    if recorder is not None:
+        sim_call(lambda: recorder.record(sim.frame, PAUSE))
     scene = 'pause'
-    for k in list(game_objects.keys()):
-        obj = game_objects[k]
-        if isinstance(obj, Obstacle):
-            obj.velocity = 0
     gui_objects['back'] = Button((WIDTH / 2 + assets['button_back'].get_width(), 10),
                                  assets['button_back'], assets['button_back_pressed'])
     gui_objects['back'].after_click = main_menu
     gui_objects['pause'].after_click = unpause
+    gui_objects.build()
 
 
 def unpause():
-    global game_objects, scene
+    global scene
     del gui_objects['back']
+    if recorder is not None:
+        sim_call(lambda: recorder.record(sim.frame, UNPAUSE))
+    if runner is not None:
+        runner.pause(False)
     scene = 'game'
-    for k in list(game_objects.keys()):
-        obj = game_objects[k]
-        if isinstance(obj, Obstacle):
-            obj.velocity = Obstacle.velocity
     gui_objects['pause'].after_click = pause
+    gui_objects.build()
 
 
-def lose():
-    global gui_objects, game_objects, scene
-    scene = 'lose'
-    for k in list(game_objects.keys()):
-        obj = game_objects[k]
-        if isinstance(obj, Obstacle):
-            obj.velocity = 0
-    bottles_recycled_text = game_font_small.render(f'Bottles Recycled: {bottles_recycled}', True, (255, 255, 255))
-    chairs_flipped_text = game_font_small.render(f'Chairs Flipped: {chairs_flipped}', True, (255, 255, 255))
-    enter_name_text = game_font_small.render(f'Type your name here. Press enter to submit.', True, (255, 255, 255))
-    gui_objects = {
-        'high_score': GuiObject((WIDTH / 2 - high_score_text.get_width() / 2, HEIGHT / 6), high_score_text),
-        'bottles': GuiObject(
-            (WIDTH / 2 - bottles_recycled_text.get_width() / 2, HEIGHT / 6 - high_score_text.get_height()),
-            bottles_recycled_text),
-        'chairs': GuiObject((WIDTH / 2 - chairs_flipped_text.get_width() / 2,
-                             HEIGHT / 6 - high_score_text.get_height() - bottles_recycled_text.get_height()),
-                            chairs_flipped_text),
+def game_action(pressed: float):
+    if recorder is not None:
+        recorder.record(sim.frame, ACTION)
+    sim.action()
+    profiler.latency.applied(pressed, sim.frame)
+
+
+def multiplayer():
+    global scene, backdrop, gui_objects, client
+    unload_scene()
+    try:
+        client = connect(NET_HOST, NET_PORT)
+    except OSError:
+        main_menu()
+        return
+    scene = 'multiplayer'
+    backdrop = get_backdrop((100, 100, 100), True)
+    gui_objects['back'] = Button((WIDTH / 2 - assets['button_back'].get_width() / 2, 10),
+                                 assets['button_back'], assets['button_back_pressed'])
+    gui_objects['back'].after_click = main_menu
+    score = Label((WIDTH / 2, HEIGHT / 7 + game_font_small.get_height()), game_font_medium,
+                  lambda: team_stat(0), 'Score: {}', anchor='midtop')
+    gui_objects['hud'] = Hud({
+        'bottles': Label((WIDTH / 2 - 10, HEIGHT / 7), game_font_small, lambda: own_stat(2), 'Bottles: {}',
+                         anchor='topright'),
+        'chairs': Label((WIDTH / 2 + 10, HEIGHT / 7), game_font_small, lambda: own_stat(1), 'Chairs: {}'),
+        'score': score,
+        'lives': Label((WIDTH / 2, score.pos.y + game_font_medium.get_height()), game_font_small,
+                       lambda: team_stat(1), 'Lives: {}', anchor='midtop'),
+        'status': Label((WIDTH / 2, HEIGHT / 2), game_font_medium,
+                        lambda: '' if client.seat is not None else f'Connecting to {NET_HOST}:{NET_PORT}...',
+                        anchor='center')
+    })
+    gui_objects.build()
+    audio.play_music('go')
+
+
+def team_stat(field: int) -> int:
+    team = client.team() if client is not None else None
+    return team[field] if team else 0
+
+
+def own_stat(field: int) -> int:
+    seat = client.own()[0] if client is not None else None
+    return seat[field] if seat else 0
+
+
+def sync_net_objects(view: dict[int, tuple[int, ...]]):
+    seen = set()
+    for key, values in view.items():
+        if key >= OBSTACLES:
+            x, y, sprite, kind = values
+            image, obs_type = sprites.images[sprite], TYPES[kind]
+            obj = net_objects.get(key)
+            if obj is None:
+                obj = net_objects[key] = Obstacle((x, y), image, obs_type)
+                game_objects.add(obj)
+            elif obj.image is not image or obj.type != obs_type:
+                obj.reset((x, y), image, obs_type)
+            else:
+                obj.pos.update(x, y)
+            seen.add(key)
+        elif key >= SEATS:
+            x, chairs, _ = values
+            seat = net_objects.get(key)
+            if seat is None:
+                seat = net_objects[key] = create_player(assets, create_ground(), x)
+                game_objects.add(seat)
+            seat.pos.x = x
+            if chairs and not seat.holding:
+                seat.hold()
+            elif not chairs and seat.holding:
+                seat.place()
+            seen.add(key)
+            if not chairs:
+                continue
+            held = [(key, 'held'), assets['obstacle_chair_side2'], 0]
+            stack = [(key, 'stack'), get_chair_stack(chairs), 4 * MULTIPLIER * (chairs - 1)]
+            for held_key, image, lift in (held, stack) if chairs > 1 else (held,):
+                obj = net_objects.get(held_key)
+                if obj is None:
+                    obj = net_objects[held_key] = GameObject((0, 0), image)
+                    game_objects.add(obj)
+                obj.image = image
+                obj.pos.update(x + world_size(seat.image)[0], seat.pos.y - lift)
+                seen.add(held_key)
+    for key in [key for key in net_objects if key not in seen]:
+        game_objects.remove(net_objects.pop(key))
+
+
+def net_action():
+    target = None
+    seat = net_objects.get(SEATS + client.seat) if client.seat is not None else None
+    if seat is not None:
+        hits = [(obj.pos.x + obj.hitbox.x, key) for key, obj in net_objects.items()
+                if isinstance(obj, Obstacle) and obj.type and obj.collides_with(seat)]
+        if hits:
+            target = min(hits)[1]
+    client.action(target, net_objects[target].type if target is not None else '')
+
+
+def build_lose() -> Generator[None, None, Widgets]:
+    line = game_font_small.get_height()
+    widgets = Widgets({
+        'high_score': Label((WIDTH / 2, HEIGHT / 6), game_font_small, lambda: round(high_score), 'High Score: {}',
+                            anchor='midtop'),
+        'bottles': Label((WIDTH / 2, HEIGHT / 6 - line), game_font_small, lambda: getattr(sim, 'bottles_recycled', 0),
+                         'Bottles Recycled: {}', anchor='midtop'),
+        'chairs': Label((WIDTH / 2, HEIGHT / 6 - line * 2), game_font_small, lambda: getattr(sim, 'chairs_flipped', 0),
+                        'Chairs Flipped: {}', anchor='midtop')
+    })
+    yield
+    widgets.update({
         'retry': Button((WIDTH / 2 + assets['button_retry'].get_width(), HEIGHT / 2),
                         assets['button_retry'], assets['button_retry_pressed']),
         'back': Button((WIDTH / 2 - assets['button_back'].get_width() * 1.5, HEIGHT / 2),
                        assets['button_back'], assets['button_back_pressed']),
-        'enter_name': GuiObject((WIDTH / 4, HEIGHT - HEIGHT / 4 + game_font_small.get_height()), enter_name_text)
-    }
-    gui_objects['retry'].after_click = game
-    gui_objects['back'].after_click = main_menu
+        'enter_name': GuiObject((WIDTH / 4, HEIGHT - HEIGHT / 4 + line),
+                                text_cache.render(game_font_small, 'Type your name here. Press enter to submit.')),
+        'name': Label((WIDTH / 4, HEIGHT - HEIGHT / 4), game_font_small, lambda: player_name, 'Name: {}')
+    })
+    widgets['retry'].after_click = game
+    widgets['back'].after_click = main_menu
+    return widgets
 
 
-def leaderboard():
+def lose():
     global gui_objects, scene
-    sort_leaderboard()
-    unload_scene()
-    scene = 'leaderboard'
-    leaderboard_text = game_font_medium.render('Leaderboard', True, (255, 255, 255))
-    gui_objects = {
-        'back': Button((0, 0), assets['button_back'], assets['button_back_pressed'])
-    }
-    gui_objects['leaderboard'] = GuiObject((gui_objects['back'].image.get_width(), 0), leaderboard_text)
-    gui_objects['back'].after_click = main_menu
-    xl = 0
-    yl = HEIGHT / 8
-    i = 0
-
-    for names, score in high_scores:
-        t = game_font_medium.render(f'{names}: {score}', True, (255, 255, 255))
-        gui_objects[f'score{i}'] = GuiObject((xl, yl), t)
-        yl += game_font_medium.get_height()
-        i += 1
+    scene = 'lose'
+    gui_objects = scenes.get('lose', build_lose)
 
 
-def settings_screen():
-    global scene, gui_objects
-    scene = 'settings'
-    pygame.mixer.stop()
-    keybind_text = game_font_medium.render(pygame.key.name(settings['action_keybind']), True, (255, 255, 255))
-    keybind_label = game_font_small.render('Action Keybind', True, (255, 255, 255))
-    music_label = game_font_small.render('Music Volume', True, (255, 255, 255))
-    sfx_label = game_font_small.render('SFX Volume', True, (255, 255, 255))
+def build_leaderboard(page: int) -> Generator[None, None, Widgets]:
+    entries = leaderboard_pages.setdefault(page, [])
+    widgets = Widgets({
+        'back': Button((0, 0), assets['button_back'], assets['button_back_pressed'])
+    })
+    widgets['leaderboard'] = GuiObject((widgets['back'].image.get_width(), 0),
+                                       text_cache.render(game_font_medium, 'Leaderboard'))
+    widgets['back'].after_click = main_menu
+    if page > 0:
+        widgets['previous'] = Button(
+            (WIDTH - assets['button_slider'].get_width() * 2 - 10, 0),
+            assets['button_slider'], assets['button_slider'])
+        widgets['previous'].after_click = lambda: leaderboard(page - 1)
+    for row in range(LEADERBOARD_PAGE):
+        yield
+        rank = page * LEADERBOARD_PAGE + row
+        widgets[f'score{rank}'] = Label(
+            (0, HEIGHT / 8 + game_font_medium.get_height() * row), game_font_medium,
+            lambda row=row, rank=rank: f'{rank + 1}. {entries[row][0]}: {entries[row][1]}'
+            if row < len(entries) else '')
+    return widgets
+
+
+def leaderboard(page: int = 0):
+    global gui_objects, scene, backdrop
+    unload_scene()
+    scene = 'leaderboard'
+    backdrop = get_backdrop((100, 100, 100))
+    entries = leaderboard_pages.setdefault(page, [])
+    entries[:] = high_scores.top(LEADERBOARD_PAGE + 1, page * LEADERBOARD_PAGE)
+    gui_objects = scenes.get(('leaderboard', page), lambda: build_leaderboard(page))
+    if len(entries) <= LEADERBOARD_PAGE:
+        if 'next' in gui_objects:
+            del gui_objects['next']
+    elif 'next' not in gui_objects:
+        gui_objects['next'] = Button(
+            (WIDTH - assets['button_slider2'].get_width(), 0),
+            assets['button_slider2'], assets['button_slider2'])
+        gui_objects['next'].after_click = lambda: leaderboard(page + 1)
+    gui_objects.build()
+
+
+def build_keybind() -> Button:
+    keybind_text = text_cache.render(game_font_medium, pygame.key.name(settings['action_keybind']))
     image = pygame.Surface((keybind_text.get_width() + 30, keybind_text.get_height() + 10))
     image_pressed = image.copy()
     image.fill((80, 80, 80))
@@ -316,45 +531,70 @@ def settings_screen():
     image_pressed.blit(keybind_text,
                        (image.get_width() / 2 - keybind_text.get_width() / 2,
                         image.get_height() / 2 - keybind_text.get_height() / 2))
-    gui_objects = {
+    button = Button((WIDTH / 2 - image.get_width() / 2, HEIGHT / 3 + 50 + assets['button_back'].get_height()),
+                    image, image_pressed)
+    button.after_click = bind
+    return button
+
+
+def build_settings() -> Generator[None, None, Widgets]:
+    keybind_label = text_cache.render(game_font_small, 'Action Keybind')
+    music_label = text_cache.render(game_font_small, 'Music Volume')
+    sfx_label = text_cache.render(game_font_small, 'SFX Volume')
+    widgets = Widgets({
         'back': Button(
             (WIDTH / 2 - assets['button_back'].get_width() / 2, HEIGHT / 3),
             assets['button_back'], assets['button_back_pressed'])
-    }
-    gui_objects['set_keybind_label'] = GuiObject(
+    })
+    widgets['set_keybind_label'] = GuiObject(
         (WIDTH / 2 - keybind_label.get_width() / 2,
-         HEIGHT / 3 + 50 + gui_objects['back'].image.get_height() - keybind_label.get_height()), keybind_label)
-    gui_objects['set_keybind'] = Button(
-        (WIDTH / 2 - image.get_width() / 2, HEIGHT / 3 + 50 + gui_objects['back'].image.get_height()),
-        image, image_pressed)
-    gui_objects['music_volume_label'] = GuiObject(
+         HEIGHT / 3 + 50 + widgets['back'].image.get_height() - keybind_label.get_height()), keybind_label)
+    yield
+    widgets['set_keybind'] = build_keybind()
+    yield
+    widgets['music_volume_label'] = GuiObject(
         (WIDTH / 2 - music_label.get_width() / 2,
-         HEIGHT / 3 + 150 + gui_objects['back'].image.get_height() - music_label.get_height()), music_label)
-    gui_objects['music_volume_left'] = Button(
+         HEIGHT / 3 + 150 + widgets['back'].image.get_height() - music_label.get_height()), music_label)
+    widgets['music_volume_left'] = Button(
         (WIDTH / 2 - assets['button_slider'].get_width() / 2 - 125,
-         HEIGHT / 3 + 150 + gui_objects['back'].image.get_height()),
+         HEIGHT / 3 + 150 + widgets['back'].image.get_height()),
         assets['button_slider'], assets['button_slider'])
-    gui_objects['music_volume_right'] = Button(
+    widgets['music_volume_right'] = Button(
         (WIDTH / 2 - assets['button_slider2'].get_width() / 2 + 125,
-         HEIGHT / 3 + 150 + gui_objects['back'].image.get_height()),
+         HEIGHT / 3 + 150 + widgets['back'].image.get_height()),
         assets['button_slider2'], assets['button_slider2'])
-    gui_objects['sfx_volume_label'] = GuiObject(
+    yield
+    widgets['sfx_volume_label'] = GuiObject(
         (WIDTH / 2 - sfx_label.get_width() / 2,
-         HEIGHT / 3 + 250 + gui_objects['back'].image.get_height() - sfx_label.get_height()), sfx_label)
-    gui_objects['sfx_volume_left'] = Button(
+         HEIGHT / 3 + 250 + widgets['back'].image.get_height() - sfx_label.get_height()), sfx_label)
+    widgets['sfx_volume_left'] = Button(
         (WIDTH / 2 - assets['button_slider'].get_width() / 2 - 125,
-         HEIGHT / 3 + 250 + gui_objects['back'].image.get_height()),
+         HEIGHT / 3 + 250 + widgets['back'].image.get_height()),
         assets['button_slider'], assets['button_slider'])
-    gui_objects['sfx_volume_right'] = Button(
+    widgets['sfx_volume_right'] = Button(
         (WIDTH / 2 - assets['button_slider2'].get_width() / 2 + 125,
-         HEIGHT / 3 + 250 + gui_objects['back'].image.get_height()),
+         HEIGHT / 3 + 250 + widgets['back'].image.get_height()),
         assets['button_slider2'], assets['button_slider2'])
-    gui_objects['back'].after_click = main_menu
-    gui_objects['set_keybind'].after_click = bind
-    gui_objects['music_volume_left'].after_click = music_volume_down
-    gui_objects['music_volume_right'].after_click = music_volume_up
-    gui_objects['sfx_volume_left'].after_click = sfx_volume_down
-    gui_objects['sfx_volume_right'].after_click = sfx_volume_up
+    yield
+    widgets['music_volume'] = Label(
+        (WIDTH / 2, HEIGHT / 3 + 150 + widgets['back'].image.get_height()), game_font_medium,
+        lambda: round(settings['music_volume'] * 100), '{}%', anchor='midtop')
+    widgets['sfx_volume'] = Label(
+        (WIDTH / 2, HEIGHT / 3 + 250 + widgets['back'].image.get_height()), game_font_medium,
+        lambda: round(settings['sfx_volume'] * 100), '{}%', anchor='midtop')
+    widgets['back'].after_click = main_menu
+    widgets['music_volume_left'].after_click = music_volume_down
+    widgets['music_volume_right'].after_click = music_volume_up
+    widgets['sfx_volume_left'].after_click = sfx_volume_down
+    widgets['sfx_volume_right'].after_click = sfx_volume_up
+    return widgets
+
+
+def settings_screen():
+    global scene, gui_objects
+    scene = 'settings'
+    audio.stop()
+    gui_objects = scenes.get('settings', build_settings)
 
 
 def bind():
@@ -366,194 +606,222 @@ def music_volume_up():
     settings['music_volume'] += 0.1
     if settings['music_volume'] > 1:
         settings['music_volume'] = 1
+    audio.set_music_volume(settings['music_volume'])
 
 
 def music_volume_down():
     settings['music_volume'] -= 0.1
     if settings['music_volume'] < 0:
         settings['music_volume'] = 0
+    audio.set_music_volume(settings['music_volume'])
 
 
 def sfx_volume_up():
     settings['sfx_volume'] += 0.1
     if settings['sfx_volume'] > 1:
         settings['sfx_volume'] = 1
-    for sound in sounds.values():
-        sound.set_volume(settings['sfx_volume'])
+    audio.set_sfx_volume(settings['sfx_volume'])
 
 
 def sfx_volume_down():
     settings['sfx_volume'] -= 0.1
     if settings['sfx_volume'] < 0:
         settings['sfx_volume'] = 0
-    for sound in sounds.values():
-        sound.set_volume(settings['sfx_volume'])
+    audio.set_sfx_volume(settings['sfx_volume'])
+
+
+def update_hover(pos: tuple[int, int]):
+    global hover
+    new_hover = gui_objects.hit(pos)
+    if new_hover is not hover:
+        if hover:
+            hover.after_hover()
+        if new_hover:
+            new_hover.hover()
+        hover = new_hover
 
 
 intro_alpha = 1
 delta_alpha = 3
-game_started = 0
-score = 0
-lives = 3
-bottles = 0
-chairs = 0
-bottles_recycled = 0
-chairs_flipped = 0
+accumulator = 0
 player_name = ''
 
-intro()
-while running:
-    delta_time = clock.tick(FPS) / 1000 * FPS
-    window.fill(bg_color)
-
-    colliding = None
-    for k, obj in list(game_objects.items()):
-        obj.update(delta_time)
-        obj.draw(window)
-        if obj.pos.x + obj.image.get_width() < 0:
-            if isinstance(obj, Obstacle):
-                if obj.type == 'chair':
-                    lives -= 1
-                    if lives <= 0:
-                        lose()
-                    sounds['fail'].play()
-                elif obj.type == 'bottle':
-                    score -= 150
-                    sounds['fail'].play()
-            del game_objects[k]
-        if isinstance(obj, Obstacle) and (colliding is None) and obj.collides_with(player):
-            colliding = k
-    for obj in gui_objects.values():
-        obj.draw(window)
-
-    if scene == 'intro':
-        intro_alpha += delta_alpha * delta_time
-        gui_objects['aharaitech'].image.set_alpha(intro_alpha)
-        gui_objects['presents'].image.set_alpha(intro_alpha)
-        if intro_alpha >= 255:
-            delta_alpha = -delta_alpha
-        if intro_alpha <= -10:
-            main_menu()
-    elif scene == 'game':
-        offset = 0
-        for i in range(chairs - 1):
-            offset += 4 * MULTIPLIER
-            window.blit(
-                assets['obstacle_chair_side2'],
-                (player.pos.x + player.image.get_width(), player.pos.y - offset)
-            )
-        score_text = game_font_medium.render(f'Score: {str(round(score))}', True, (255, 255, 255))
-        bottles_text = game_font_small.render(f'Bottles: {str(bottles)}', True, (255, 255, 255))
-        chairs_text = game_font_small.render(f'Chairs: {str(chairs)}', True, (255, 255, 255))
-        lives_text = game_font_small.render(f'Lives: {str(lives)}', True, (255, 255, 255))
-        if score > high_score:
-            high_score = score
-            high_score_text = game_font_small.render(f'High Score: {str(round(high_score))}', True, (255, 255, 255))
-        window.blit(bottles_text, (WIDTH / 2 - bottles_text.get_width() - 10, HEIGHT / 7))
-        window.blit(chairs_text, (WIDTH / 2 + 10, HEIGHT / 7))
-        window.blit(score_text, (WIDTH / 2 - score_text.get_width() / 2, HEIGHT / 7 + bottles_text.get_height()))
-        window.blit(high_score_text, (WIDTH / 2 - high_score_text.get_width() / 2,
-                                      HEIGHT / 7 + bottles_text.get_height() + score_text.get_height()))
-        window.blit(lives_text, (player.pos.x, player.pos.y - lives_text.get_height()))
-    elif scene == 'lose':
-        name_text = game_font_small.render(f'Name: {player_name}', True, (255, 255, 255))
-        window.blit(name_text, (WIDTH / 4, HEIGHT - HEIGHT / 4))
-    elif scene == 'settings':
-        volume = game_font_medium.render(f'{round(settings["music_volume"] * 100)}%', True, (255, 255, 255))
-        window.blit(volume,
-                    (WIDTH / 2 - volume.get_width() / 2, HEIGHT / 3 + 150 + gui_objects['back'].image.get_height()))
-        volume = game_font_medium.render(f'{round(settings["sfx_volume"] * 100)}%', True, (255, 255, 255))
-        window.blit(volume,
-                    (WIDTH / 2 - volume.get_width() / 2, HEIGHT / 3 + 250 + gui_objects['back'].image.get_height()))
-
-    if scene == 'game' and (time := (pygame.time.get_ticks() - game_started) // 1000) % rates['obstacle'] == 0:
-        if f'obs{str(time)}' not in game_objects.keys():
-            game_objects[f'obs{str(time)}'] = random.choice(obstacles).copy()
-
-    if scene == 'game' and (time := (pygame.time.get_ticks() - game_started) // 1000) % rates['recycle'] == 0:
-        if f'bottle{str(time)}' not in game_objects.keys():
-            game_objects[f'bottle{str(time)}'] = random.choice(recycle_obs).copy()
-
-    # fps = game_font_big.render(str(round(clock.get_fps())), True, (255, 255, 255))
-    # window.blit(fps, (WIDTH-fps.get_width(), HEIGHT-fps.get_height()))
-    pygame.display.flip()
 
+def handle_events():
+    global player_name, replay_speed
+    pressed = time.perf_counter()
+    motion = None
     for event in pygame.event.get():
+        if motion is not None and event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            update_hover(motion)
+            motion = None
         match event.type:
             case pygame.QUIT:
                 stop_game()
             case pygame.MOUSEMOTION:
-                x = event.pos[0]
-                y = event.pos[1]
-                new_hover = None
-                for obj in gui_objects.values():
-                    if obj.pos.x < x < obj.pos.x + obj.image.get_width() \
-                            and obj.pos.y < y < obj.pos.y + obj.image.get_height():
-                        new_hover = obj
-                        obj.hover()
-                        break
-                if hover and hover is not new_hover:
-                    hover.after_hover()
-                hover = new_hover
+                motion = event.pos
             case pygame.MOUSEBUTTONDOWN:
                 if hover:
                     hover.click()
             case pygame.MOUSEBUTTONUP:
                 if hover:
                     hover.after_click()
+            case pygame.KEYDOWN if event.key == pygame.K_F3:
+                profiler.toggle()
+                sim_call(sim_profiler.toggle)
             case pygame.KEYDOWN:
                 if scene == 'lose':
                     if event.key == pygame.K_RETURN and player_name != '':
-                        high_scores.append([player_name, str(score)])
+                        if recorder is not None:
+                            recorder.record(sim.frame, NAME, player_name)
+                        high_scores.submit(player_name, sim.score)
                         main_menu()
                     elif event.key == pygame.K_BACKSPACE:
                         player_name = player_name[:-1]
                     elif event.unicode in ALPHABET and len(player_name) < 16:
                         player_name += event.unicode
                 elif scene == 'bind':
-                    settings['action_keybind'] = event.key
+                    if settings['action_keybind'] != event.key:
+                        settings['action_keybind'] = event.key
+                        gui_objects['set_keybind'] = build_keybind()
+                        gui_objects.build()
                     settings_screen()
                 elif scene == 'intro':
+                    load_deferred()
                     main_menu()
-                elif scene == 'game' and colliding is not None and event.key == settings['action_keybind']:
-                    if game_objects[colliding].type == 'chair' and chairs < max_values['chair']:
-                        del game_objects[colliding]
-                        player.hold()
-                        sounds['got'].play()
-                        if 'holding' not in list(game_objects.keys()):
-                            game_objects['holding'] = GameObject(
-                                (player.pos.x + player.image.get_width(), player.pos.y),
-                                assets['obstacle_chair_side2']
-                            )
-                        chairs += 1
-                    elif game_objects[colliding].type == 'bottle' and bottles < max_values['bottle']:
-                        del game_objects[colliding]
-                        sounds['got'].play()
-                        bottles += 1
-                    elif game_objects[colliding].type == 'table' and 'holding' in game_objects.keys():
-                        sounds['success'].play()
-                        score += 100
-                        chairs -= 1
-                        col = game_objects[colliding].copy()
-                        hol = game_objects['holding'].copy()
-                        game_objects['table'] = Obstacle(col.pos, col.image, '')
-                        game_objects['placed'] = Obstacle(
-                            (col.pos.x - 4 * MULTIPLIER, col.pos.y - 18 * MULTIPLIER),
-                            pygame.transform.flip(hol.image, False, True), ''
-                        )
-                        if chairs <= 0:
-                            chairs = 0
-                            player.place()
-                            del game_objects['holding']
-                        del game_objects[colliding]
-                    elif game_objects[colliding].type == 'bin' and bottles > 0:
-                        sounds['success'].play()
-                        score += 25 * bottles
-                        bottles = 0
-
-sort_leaderboard()
-with open('highscore', 'w') as f:
-    json.dump(high_scores, f)
-with open('settings', 'w') as f:
-    json.dump(settings, f)
-pygame.quit()
+                elif scene == 'game' and event.key == settings['action_keybind']:
+                    sim_call(lambda: game_action(pressed))
+                elif scene == 'multiplayer':
+                    if event.key == pygame.K_ESCAPE:
+                        main_menu()
+                    elif event.key == settings['action_keybind']:
+                        net_action()
+                elif scene == 'replay':
+                    if event.key == pygame.K_ESCAPE:
+                        main_menu()
+                    elif event.key == pygame.K_LEFT:
+                        seek_replay(-REPLAY_SEEK)
+                    elif event.key == pygame.K_RIGHT:
+                        seek_replay(REPLAY_SEEK)
+                    elif event.key in (pygame.K_UP, pygame.K_DOWN):
+                        i = REPLAY_SPEEDS.index(replay_speed) + (1 if event.key == pygame.K_UP else -1)
+                        replay_speed = REPLAY_SPEEDS[min(max(i, 0), len(REPLAY_SPEEDS) - 1)]
+    if motion is not None:
+        update_hover(motion)
+
+
+def step_frame():
+    global accumulator, intro_alpha, delta_alpha, high_score, first_frame
+    frame_time = clock.tick(FPS) / 1000
+    delta_time = frame_time * FPS
+    profiler.begin()
+    handle_events()
+    profiler.lap('events')
+
+    if scene == 'game' and runner is not None:
+        for name in runner.poll_events():
+            audio.play(name)
+        previous, current = runner.snapshots
+        view.update(previous, current, sim.timestep)
+        if current.over:
+            stop_runner()
+            lose()
+        profiler.lap('update')
+    elif scene == 'game':
+        accumulator = min(accumulator + frame_time, 0.25)
+        while accumulator >= sim.timestep:
+            sim.step()
+            accumulator -= sim.timestep
+        for name in sim.events:
+            audio.play(name)
+        sim.events.clear()
+        if sim.over:
+            lose()
+        profiler.lap('update')
+    elif scene == 'multiplayer':
+        client.poll()
+        client.update()
+        sync_net_objects(client.view())
+        team = client.team()
+        if client.closed or team is not None and team[2]:
+            main_menu()
+        profiler.lap('update')
+    elif scene == 'replay':
+        accumulator = min(accumulator + frame_time * replay_speed, 0.25 * replay_speed)
+        while accumulator >= sim.timestep and not playback.finished:
+            playback.step()
+            accumulator -= sim.timestep
+        for name in sim.events:
+            audio.play(name)
+        sim.events.clear()
+        profiler.lap('update')
+
+    if scene == 'intro':
+        intro_alpha += delta_alpha * delta_time
+        gui_objects['aharaitech'].image.set_alpha(intro_alpha)
+        gui_objects['presents'].image.set_alpha(intro_alpha)
+        renderer.mark(gui_objects['aharaitech'].get_rect(), gui_objects['presents'].get_rect())
+        if intro_alpha >= 255:
+            delta_alpha = -delta_alpha
+        if intro_alpha <= -10:
+            main_menu()
+    elif scene in ('game', 'replay'):
+        state = sim_state()
+        shown = view[player] if runner is not None else player
+        if state.chairs > 1:
+            chair_stack.image = get_chair_stack(state.chairs)
+            chair_stack.pos.update(shown.pos.x + world_size(shown.image)[0],
+                                   shown.pos.y - 4 * MULTIPLIER * (state.chairs - 1))
+        if scene == 'game' and state.score > high_score:
+            high_score = state.score
+        gui_objects['hud']['lives'].move(shown.pos)
+
+    profiler.lap('hud')
+
+    entities = view.values() if runner is not None else list(game_objects.values())
+    if isinstance(sim, RushHourSimulation):
+        entities.append(sim.store)
+    layers = {ENTITIES: entities, GUI: gui_objects.values()}
+    if scene in ('game', 'replay') and sim_state().chairs > 1:
+        layers[HELD] = (chair_stack,)
+    if profiler:
+        layers[OVERLAY] = (profiler_overlay, sim_overlay) if runner is not None else (profiler_overlay,)
+    if DIRTY_RENDERING and not LOW_RES:
+        dirty = renderer.render(backdrop, layers)
+        pygame.display.update(dirty)
+    else:
+        renderer.invalidate()
+        renderer.render(backdrop, layers)
+        pygame.display.flip()
+    if sim is not None:
+        profiler.latency.presented(view.frame if runner is not None else sim.frame)
+    profiler.lap('flip')
+    if not first_frame:
+        first_frame = time.perf_counter()
+        print(f'First frame in {(first_frame - startup) * 1000:.0f} ms')
+        load_deferred()
+
+    scenes.idle()
+    profiler.lap('idle')
+    profiler.end()
+
+
+def main():
+    if len(sys.argv) > 1:
+        load_deferred()
+        watch_replay(sys.argv[1])
+    else:
+        intro()
+    while running:
+        step_frame()
+    stop_runner()
+    save_replay()
+    profiler.close()
+    high_scores.close()
+    with open('settings', 'w') as f:
+        json.dump(settings, f)
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
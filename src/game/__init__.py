@@ -1,3 +1,14 @@
-from .game_object import GameObject
+from .game_object import GameObject, world_size
+from .sprites import SpriteCache, MaskCache, sprite_cache, mask_cache
 from .obstacle import Obstacle
 from .player import Player
+from .collision import SweepAndPrune
+from .pool import ObstaclePool
+from .registry import Registry
+from .scheduler import Rate, Scheduler, rate_at
+from .simulation import Simulation
+from .store import EntityStore
+from .rush_hour import RushHourSimulation
+from .multiplayer import MultiplayerSimulation, Seat
+from .replay import Replay, ReplayPlayer
+from .runner import Snapshot, SimulationThread, SnapshotView
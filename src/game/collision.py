@@ -0,0 +1,43 @@
+from bisect import bisect_left, bisect_right
+from .game_object import GameObject
+from .obstacle import Obstacle
+
+
+def left(obj: GameObject) -> float:
+    return obj.pos.x + obj.hitbox.x
+
+
+class SweepAndPrune:
+    __slots__ = ('objects', 'max_width')
+
+    def __init__(self) -> None:
+        self.objects: list[Obstacle] = []
+        self.max_width = 0
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def __contains__(self, obj: Obstacle) -> bool:
+        return obj in self.objects
+
+    def add(self, obj: Obstacle) -> None:
+        self.objects.insert(bisect_right(self.objects, left(obj), key=left), obj)
+        self.max_width = max(self.max_width, obj.hitbox.w)
+
+    def remove(self, obj: Obstacle) -> None:
+        self.objects.remove(obj)
+
+    def clear(self) -> None:
+        self.objects.clear()
+        self.max_width = 0
+
+    def query(self, other: GameObject) -> Obstacle | None:
+        hitbox = other.get_world_hitbox()
+        objects = self.objects
+        for i in range(bisect_left(objects, hitbox.left - self.max_width, key=left), len(objects)):
+            obj = objects[i]
+            if left(obj) >= hitbox.right:
+                break
+            if obj.collides_with(other):
+                return obj
+        return None
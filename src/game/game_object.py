@@ -1,21 +1,59 @@
 import pygame
+from config import WORLD_SCALE
+from .sprites import mask_cache
+
+
+def world_size(image: pygame.Surface) -> tuple[int, int]:
+    return image.get_width() * WORLD_SCALE, image.get_height() * WORLD_SCALE
 
 
 class GameObject:
+    __slots__ = ('pos', 'image', 'mask', 'hitbox', 'world_hitbox', 'drawn_rect', 'drawn_image')
+
     def __init__(self, pos: tuple[float, float],
                  image: pygame.Surface) -> None:
         self.pos = pygame.Vector2(*pos)
         self.image = image
-        self.hitbox = pygame.Rect(0, 0, image.get_width(), image.get_height())
+        self.hitbox = pygame.Rect(0, 0, 0, 0)
+        self.world_hitbox = pygame.Rect(0, 0, 0, 0)
+        self.fit_hitbox()
+        self.drawn_rect: pygame.Rect | None = None
+        self.drawn_image: pygame.Surface | None = None
+
+    def reset(self, pos: tuple[float, float] | pygame.Vector2, image: pygame.Surface) -> None:
+        self.pos.update(pos)
+        if image is not self.image:
+            self.image = image
+            self.fit_hitbox()
+
+    def fit_hitbox(self) -> None:
+        self.mask, bounds = mask_cache.get(self.image)
+        self.hitbox.update(bounds.x * WORLD_SCALE, bounds.y * WORLD_SCALE, bounds.w * WORLD_SCALE,
+                           bounds.h * WORLD_SCALE)
+        self.world_hitbox.size = self.hitbox.size
 
     def get_world_hitbox(self):
-        hitbox = self.hitbox.copy()
-        hitbox.x += self.pos.x
-        hitbox.y += self.pos.y
-        return hitbox
+        self.world_hitbox.x = self.hitbox.x + self.pos.x
+        self.world_hitbox.y = self.hitbox.y + self.pos.y
+        return self.world_hitbox
+
+    def get_rect(self) -> pygame.Rect:
+        rect = pygame.Rect((0, 0), world_size(self.image))
+        rect.topleft = self.pos
+        return rect
+
+    def get_dirty_rects(self) -> list[pygame.Rect]:
+        rect = self.get_rect()
+        if self.drawn_rect is None:
+            return [rect]
+        if self.image is self.drawn_image and rect == self.drawn_rect:
+            return []
+        return [self.drawn_rect, rect]
 
-    def draw(self, surface: pygame.Surface) -> None:
-        surface.blit(self.image, self.pos)
+    def submit(self, blits: list[tuple[pygame.Surface, pygame.Rect]]) -> None:
+        self.drawn_rect = self.get_rect()
+        self.drawn_image = self.image
+        blits.append((self.image, self.drawn_rect))
         # pygame.draw.rect(surface, (255, 0, 0),
         #                  (self.pos.x+self.hitbox.x, self.pos.y+self.hitbox.y, self.hitbox.w, self.hitbox.h), 4)
 
@@ -0,0 +1,77 @@
+from .game_object import GameObject
+from .obstacle import Obstacle
+from .player import Player
+from .simulation import Simulation
+
+SEAT_STATE = ('player', 'holding', 'holding_name', 'chairs', 'bottles', 'colliding')
+
+
+class Seat:
+    __slots__ = ('id', *SEAT_STATE)
+
+    def __init__(self, seat_id: int, player: Player, holding: GameObject) -> None:
+        self.id = seat_id
+        self.player = player
+        self.holding = holding
+        self.holding_name = f'holding{seat_id}'
+        self.chairs = 0
+        self.bottles = 0
+        self.colliding: Obstacle | None = None
+
+
+class MultiplayerSimulation(Simulation):
+    mode = 'multiplayer'
+
+    def __init__(self, *args, seat: int = 0, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.seats: dict[int, Seat] = {}
+        self.ids: dict[GameObject, int] = {}
+        self.next_id = 0
+        self.game_objects.remove(self.player)
+        self.join(seat, self.player)
+
+    def join(self, seat_id: int, player: Player) -> Seat:
+        seat = self.seats[seat_id] = Seat(seat_id, player, GameObject((0, 0), self.holding_image))
+        self.game_objects[f'player{seat_id}'] = player
+        return seat
+
+    def leave(self, seat_id: int) -> None:
+        seat = self.seats.pop(seat_id)
+        self.game_objects.remove(seat.player)
+        if seat.holding_name in self.game_objects:
+            self.game_objects.remove(seat.holding)
+
+    def load(self, seat: Seat) -> None:
+        for name in SEAT_STATE:
+            setattr(self, name, getattr(seat, name))
+
+    def store(self, seat: Seat) -> None:
+        for name in SEAT_STATE:
+            setattr(seat, name, getattr(self, name))
+
+    def collide(self) -> Obstacle | None:
+        for seat in self.seats.values():
+            seat.colliding = self.collision.query(seat.player)
+        return None
+
+    def action(self, seat_id: int = 0) -> None:
+        seat = self.seats.get(seat_id)
+        if seat is None:
+            return
+        self.load(seat)
+        super().action()
+        self.store(seat)
+        for other in self.seats.values():
+            if other.colliding is not None and other.colliding not in self.collision:
+                other.colliding = None
+
+    def release(self, obj: GameObject) -> None:
+        super().release(obj)
+        self.ids.pop(obj, None)
+
+    def entity_id(self, obj: GameObject) -> int:
+        i = self.ids.get(obj)
+        if i is None:
+            i = self.ids[obj] = self.next_id
+            self.next_id += 1
+        return i
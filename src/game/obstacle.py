@@ -1,25 +1,31 @@
 import pygame
+from config import WORLD_SCALE
 from .game_object import GameObject
 
 
 class Obstacle(GameObject):
+    __slots__ = ('type',)
     velocity = 10
 
     def __init__(self, pos: tuple[float, float], image: pygame.Surface, obs_type: str) -> None:
         super().__init__(pos, image)
         self.type = obs_type
 
+    def reset(self, pos: tuple[float, float] | pygame.Vector2, image: pygame.Surface, obs_type: str) -> None:
+        super().reset(pos, image)
+        self.type = obs_type
+
     def collides_with(self, other: GameObject):
-        return self.get_world_hitbox().colliderect(other.get_world_hitbox())
+        if not self.get_world_hitbox().colliderect(other.get_world_hitbox()):
+            return False
+        offset = (round((other.pos.x - self.pos.x) / WORLD_SCALE), round((other.pos.y - self.pos.y) / WORLD_SCALE))
+        return self.mask.overlap(other.mask, offset) is not None
 
     def update(self, delta_time: float) -> None:
         self.pos.x -= self.velocity * delta_time
 
     def copy(self):
-        obs = Obstacle(self.pos, self.image, self.hitbox)
-        obs.collide = self.collide
-        obs.type = self.type
-        return obs
+        return Obstacle(self.pos, self.image, self.type)
 
     def collide(self, *args, **kwargs):
         pass
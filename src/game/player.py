@@ -1,11 +1,13 @@
 import pygame
-from .game_object import GameObject
+from .game_object import GameObject, world_size
 
 
 class Player(GameObject):
+    __slots__ = ('original_image', 'hold_image', 'ground_y', 'holding')
+
     def __init__(self, x: float, ground_y: float, image: pygame.Surface,
                  hold_image: pygame.Surface) -> None:
-        super().__init__((x, ground_y - image.get_height()), image)
+        super().__init__((x, ground_y - world_size(image)[1]), image)
         self.original_image = image
         self.hold_image = hold_image
         self.ground_y = ground_y
@@ -14,9 +16,11 @@ class Player(GameObject):
     def hold(self):
         self.holding = True
         self.image = self.hold_image
-        self.pos.y = self.ground_y - self.image.get_height()
+        self.fit_hitbox()
+        self.pos.y = self.ground_y - world_size(self.image)[1]
 
     def place(self):
         self.holding = False
         self.image = self.original_image
-        self.pos.y = self.ground_y - self.image.get_height()
+        self.fit_hitbox()
+        self.pos.y = self.ground_y - world_size(self.image)[1]
@@ -0,0 +1,22 @@
+import pygame
+from .obstacle import Obstacle
+
+
+class ObstaclePool:
+    __slots__ = ('free',)
+
+    def __init__(self) -> None:
+        self.free: list[Obstacle] = []
+
+    def __len__(self) -> int:
+        return len(self.free)
+
+    def acquire(self, pos: tuple[float, float] | pygame.Vector2, image: pygame.Surface, obs_type: str) -> Obstacle:
+        if not self.free:
+            return Obstacle(pos, image, obs_type)
+        obs = self.free.pop()
+        obs.reset(pos, image, obs_type)
+        return obs
+
+    def release(self, obs: Obstacle) -> None:
+        self.free.append(obs)
@@ -0,0 +1,61 @@
+from typing import Iterator
+from .game_object import GameObject
+
+
+class Registry:
+    __slots__ = ('objects', 'names', 'slots', 'labels', 'holes')
+
+    def __init__(self) -> None:
+        self.objects: list[GameObject | None] = []
+        self.names: dict[str, GameObject] = {}
+        self.slots: dict[GameObject, int] = {}
+        self.labels: dict[GameObject, str] = {}
+        self.holes = 0
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __iter__(self) -> Iterator[GameObject]:
+        return iter(self.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+
+    def __getitem__(self, name: str) -> GameObject:
+        return self.names[name]
+
+    def __setitem__(self, name: str, obj: GameObject) -> None:
+        old = self.names.get(name)
+        if old is None:
+            self.add(obj)
+        else:
+            i = self.slots.pop(old)
+            del self.labels[old]
+            self.objects[i] = obj
+            self.slots[obj] = i
+        self.names[name] = obj
+        self.labels[obj] = name
+
+    def get(self, name: str) -> GameObject | None:
+        return self.names.get(name)
+
+    def values(self) -> list[GameObject]:
+        if self.holes:
+            self.compact()
+        return self.objects
+
+    def add(self, obj: GameObject) -> None:
+        self.slots[obj] = len(self.objects)
+        self.objects.append(obj)
+
+    def remove(self, obj: GameObject) -> None:
+        self.objects[self.slots.pop(obj)] = None
+        self.holes += 1
+        name = self.labels.pop(obj, None)
+        if name is not None:
+            del self.names[name]
+
+    def compact(self) -> None:
+        self.objects = [obj for obj in self.objects if obj is not None]
+        self.slots = {obj: i for i, obj in enumerate(self.objects)}
+        self.holes = 0
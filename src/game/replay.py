@@ -0,0 +1,153 @@
+import json
+import struct
+from typing import Callable
+from .scheduler import Rate
+from .simulation import Simulation
+
+MAGIC = b'CRRP'
+VERSION = 2
+HEADER = struct.Struct('<4sBQH')
+
+ACTION = 0
+PAUSE = 1
+UNPAUSE = 2
+NAME = 3
+END = 4
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7f:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, i: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[i]
+        i += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, i
+        shift += 7
+
+
+class Replay:
+    def __init__(self, seed: int, rates: dict[str, Rate], max_values: dict[str, int], mode: str = 'normal',
+                 scores: dict[str, int] | None = None) -> None:
+        self.seed = seed
+        self.mode = mode
+        self.rates = dict(rates)
+        self.max_values = dict(max_values)
+        self.scores = None if scores is None else dict(scores)
+        self.events: list[tuple[int, int, str]] = []
+
+    @classmethod
+    def of(cls, sim: Simulation) -> 'Replay':
+        return cls(sim.seed, sim.rates, sim.max_values, sim.mode, sim.scores)
+
+    @property
+    def frames(self) -> int:
+        return self.events[-1][0] if self.events else 0
+
+    @property
+    def name(self) -> str:
+        for _, kind, text in self.events:
+            if kind == NAME:
+                return text
+        return ''
+
+    def record(self, frame: int, kind: int, text: str = '') -> None:
+        self.events.append((frame, kind, text))
+
+    def to_bytes(self) -> bytes:
+        config = json.dumps({'rates': self.rates, 'max_values': self.max_values, 'mode': self.mode,
+                             'scores': self.scores}, separators=(',', ':')).encode()
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, len(config)))
+        out += config
+        last = 0
+        for frame, kind, text in self.events:
+            write_varint(out, frame - last)
+            out.append(kind)
+            if kind == NAME:
+                encoded = text.encode()
+                write_varint(out, len(encoded))
+                out += encoded
+            last = frame
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        magic, version, seed, length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('not a replay file')
+        i = HEADER.size + length
+        config = json.loads(data[HEADER.size:i])
+        replay = cls(seed, config['rates'], config['max_values'], config.get('mode', 'normal'), config.get('scores'))
+        frame = 0
+        while i < len(data):
+            delta, i = read_varint(data, i)
+            frame += delta
+            kind = data[i]
+            i += 1
+            text = ''
+            if kind == NAME:
+                length, i = read_varint(data, i)
+                text = data[i:i + length].decode()
+                i += length
+            replay.events.append((frame, kind, text))
+        return replay
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayPlayer:
+    def __init__(self, replay: Replay, factory: Callable[[Replay], Simulation]) -> None:
+        self.replay = replay
+        self.factory = factory
+        self.sim = factory(replay)
+        self.index = 0
+        self.apply()
+
+    @property
+    def finished(self) -> bool:
+        return self.sim.over or self.index >= len(self.replay.events)
+
+    def restart(self) -> None:
+        self.sim = self.factory(self.replay)
+        self.index = 0
+        self.apply()
+
+    def apply(self) -> None:
+        events = self.replay.events
+        while self.index < len(events) and events[self.index][0] <= self.sim.frame:
+            if events[self.index][1] == ACTION:
+                self.sim.action()
+            self.index += 1
+
+    def step(self) -> None:
+        if self.finished:
+            return
+        self.sim.step()
+        self.apply()
+
+    def seek(self, frame: int) -> None:
+        if frame < self.sim.frame:
+            self.restart()
+        while self.sim.frame < frame and not self.finished:
+            self.step()
+        self.sim.events.clear()
+
+    def run(self) -> Simulation:
+        while not self.finished:
+            self.step()
+        self.sim.events.clear()
+        return self.sim
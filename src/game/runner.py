@@ -0,0 +1,139 @@
+import queue
+import threading
+import time
+from typing import Callable, NamedTuple
+import pygame
+from .game_object import GameObject
+from .simulation import Simulation
+
+
+class Snapshot(NamedTuple):
+    frame: int
+    time: float
+    entities: tuple[tuple[GameObject, pygame.Surface, float, float], ...]
+    score: float
+    lives: int
+    chairs: int
+    bottles: int
+    over: bool
+
+
+def capture(sim: Simulation) -> Snapshot:
+    return Snapshot(sim.frame, time.perf_counter(),
+                    tuple((obj, obj.image, obj.pos.x, obj.pos.y) for obj in sim.game_objects),
+                    sim.score, sim.lives, sim.chairs, sim.bottles, sim.over)
+
+
+class SimulationThread:
+    def __init__(self, sim: Simulation, profiler=None, max_lag: float = 0.25) -> None:
+        self.sim = sim
+        self.profiler = profiler
+        self.max_lag = max_lag
+        self.calls: queue.SimpleQueue[Callable[[], None]] = queue.SimpleQueue()
+        self.events: queue.SimpleQueue[str] = queue.SimpleQueue()
+        snapshot = capture(sim)
+        self.snapshots = (snapshot, snapshot)
+        self.paused = False
+        self.running = False
+        self.thread: threading.Thread | None = None
+
+    @property
+    def latest(self) -> Snapshot:
+        return self.snapshots[1]
+
+    def start(self) -> None:
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name='simulation', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+
+    def call(self, function: Callable[[], None]) -> None:
+        self.calls.put(function)
+
+    def pause(self, paused: bool = True) -> None:
+        self.call(lambda: setattr(self, 'paused', paused))
+
+    def flush(self) -> None:
+        while True:
+            try:
+                function = self.calls.get_nowait()
+            except queue.Empty:
+                return
+            function()
+
+    def poll_events(self) -> list[str]:
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def tick(self) -> None:
+        sim = self.sim
+        self.flush()
+        if self.paused or sim.over:
+            return
+        profiler = self.profiler
+        if profiler:
+            profiler.begin()
+        sim.step()
+        for name in sim.events:
+            self.events.put(name)
+        sim.events.clear()
+        self.snapshots = (self.snapshots[1], capture(sim))
+        if profiler:
+            profiler.end()
+
+    def run(self) -> None:
+        deadline = time.perf_counter()
+        while self.running:
+            self.tick()
+            deadline += self.sim.timestep
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -self.max_lag:
+                deadline = time.perf_counter()
+
+
+class SnapshotView:
+    def __init__(self) -> None:
+        self.objects: dict[GameObject, GameObject] = {}
+        self.frame = 0
+
+    def __getitem__(self, key: GameObject) -> GameObject:
+        return self.objects[key]
+
+    def values(self) -> list[GameObject]:
+        return list(self.objects.values())
+
+    def update(self, previous: Snapshot, current: Snapshot, timestep: float) -> None:
+        self.frame = current.frame
+        t = min(max((time.perf_counter() - current.time) / timestep, 0.0), 1.0)
+        before = {key: (image, x, y) for key, image, x, y in previous.entities}
+        objects = {}
+        for key, image, x, y in current.entities:
+            old = before.get(key)
+            # obstacles only move left, so a jump right means the pool handed the object out again
+            if old is not None and old[0] is image and old[1] >= x:
+                x = old[1] + (x - old[1]) * t
+                y = old[2] + (y - old[2]) * t
+            obj = self.objects.get(key)
+            if obj is None:
+                obj = GameObject((x, y), image)
+            else:
+                obj.image = image
+                obj.pos.update(x, y)
+            objects[key] = obj
+        self.objects = objects
+
+    def clear(self) -> None:
+        self.objects.clear()
+        self.frame = 0
@@ -0,0 +1,71 @@
+from config import WIDTH, FPS, RUSH_HOUR_RATE, RUSH_HOUR_SECONDS
+from .game_object import GameObject
+from .obstacle import Obstacle
+from .simulation import Simulation
+from .store import EntityStore
+
+
+class RushHourSimulation(Simulation):
+    mode = 'rush_hour'
+
+    def __init__(self, *args, spawn_rate: float = RUSH_HOUR_RATE, seconds: float = RUSH_HOUR_SECONDS,
+                 **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.spawn_rate = spawn_rate
+        self.frames = round(seconds * FPS)
+        self.due = 0.0
+        self.store = EntityStore()
+        self.target = Obstacle((0, 0), self.holding_image, '')
+        self.target_index = -1
+
+    def step(self) -> None:
+        super().step()
+        if self.frame >= self.frames:
+            self.over = True
+
+    def move(self) -> None:
+        super().move()
+        self.store.update(self.timestep * FPS)
+        self.store.cull()
+
+    def despawn(self, obs_type: str) -> None:
+        pass
+
+    def collide(self) -> Obstacle | None:
+        for i in self.store.overlap(self.player.get_world_hitbox(), self.wanted()):
+            self.target.reset(self.store.get_pos(i), self.store.get_image(i), self.store.get_type(i))
+            if self.target.collides_with(self.player):
+                self.target_index = i
+                return self.target
+        self.target_index = -1
+        return None
+
+    def wanted(self) -> list[str]:
+        types = []
+        if self.chairs < self.max_values['chair']:
+            types.append('chair')
+        if self.bottles < self.max_values['bottle']:
+            types.append('bottle')
+        if self.holding_name in self.game_objects:
+            types.append('table')
+        if self.bottles > 0:
+            types.append('bin')
+        return types
+
+    def remove(self, obj: GameObject) -> None:
+        if obj is self.target:
+            self.store.remove(self.target_index)
+            self.target_index = -1
+        else:
+            super().remove(obj)
+
+    def spawn_from(self, templates: tuple[Obstacle, ...]) -> None:
+        self.store.add(self.random.choice(templates))
+
+    def spawn(self) -> None:
+        super().spawn()
+        self.due += self.spawn_rate * self.timestep
+        while self.due >= 1:
+            self.due -= 1
+            template = self.random.choice(self.obstacles + self.recycle_obs)
+            self.store.add(template, template.pos.x + self.random.uniform(0, WIDTH))
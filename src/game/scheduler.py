@@ -0,0 +1,41 @@
+import heapq
+from bisect import bisect
+from typing import Callable, Sequence
+
+Rate = float | Sequence[Sequence[float]]
+
+
+def rate_at(rate: Rate, seconds: float) -> float:
+    if isinstance(rate, (int, float)):
+        return rate
+    times = [point[0] for point in rate]
+    i = bisect(times, seconds)
+    if i == 0:
+        return rate[0][1]
+    if i == len(rate):
+        return rate[-1][1]
+    (t0, r0), (t1, r1) = rate[i - 1], rate[i]
+    return r0 + (r1 - r0) * (seconds - t0) / (t1 - t0)
+
+
+class Scheduler:
+    __slots__ = ('queue', 'count')
+
+    def __init__(self) -> None:
+        self.queue: list[tuple[int, int, Callable[[], None]]] = []
+        self.count = 0
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def at(self, frame: int, callback: Callable[[], None]) -> None:
+        heapq.heappush(self.queue, (frame, self.count, callback))
+        self.count += 1
+
+    def run(self, frame: int) -> None:
+        queue = self.queue
+        while queue and queue[0][0] <= frame:
+            heapq.heappop(queue)[2]()
+
+    def clear(self) -> None:
+        self.queue.clear()
@@ -0,0 +1,172 @@
+import random
+import pygame
+from config import FPS, MULTIPLIER, scores
+from .collision import SweepAndPrune
+from .game_object import GameObject, world_size
+from .obstacle import Obstacle
+from .player import Player
+from .pool import ObstaclePool
+from .registry import Registry
+from .sprites import sprite_cache
+from .scheduler import Rate, Scheduler, rate_at
+
+
+class Simulation:
+    timestep = 1 / FPS
+    mode = 'normal'
+
+    def __init__(self,
+                 player: Player,
+                 obstacles: tuple[Obstacle, ...],
+                 recycle_obs: tuple[Obstacle, ...],
+                 holding_image: pygame.Surface,
+                 rates: dict[str, Rate],
+                 max_values: dict[str, int],
+                 game_objects: Registry | None = None,
+                 seed: int | None = None,
+                 sim_scores: dict[str, int] | None = None) -> None:
+        self.player = player
+        self.obstacles = obstacles
+        self.recycle_obs = recycle_obs
+        self.holding_image = holding_image
+        self.rates = rates
+        self.max_values = max_values
+        self.scores = scores if sim_scores is None else sim_scores
+        self.seed = random.getrandbits(63) if seed is None else seed
+        self.random = random.Random(self.seed)
+        self.game_objects = Registry() if game_objects is None else game_objects
+        self.game_objects['player'] = player
+        # reused across pickups; the dirty renderer forgets its drawn rect whenever it leaves the registry
+        self.holding = GameObject((0, 0), holding_image)
+        self.holding_name = 'holding'
+        self.collision = SweepAndPrune()
+        self.pool = ObstaclePool()
+        self.frame = 0
+        self.scheduler = Scheduler()
+        self.slots = {'obstacle': 0.0, 'recycle': 0.0}
+        self.schedule('obstacle', obstacles)
+        self.schedule('recycle', recycle_obs)
+        self.colliding: Obstacle | None = None
+        self.events: list[str] = []
+        self.profiler = None
+        self.over = False
+        self.score = 0
+        self.lives = 3
+        self.bottles = 0
+        self.chairs = 0
+        self.bottles_recycled = 0
+        self.chairs_flipped = 0
+
+    @property
+    def time(self) -> float:
+        return self.frame * self.timestep
+
+    def step(self) -> None:
+        if self.over:
+            return
+        self.frame += 1
+        self.move()
+        self.colliding = self.collide()
+        if self.profiler:
+            self.profiler.lap('update')
+        self.spawn()
+        if self.profiler:
+            self.profiler.lap('spawn')
+
+    def move(self) -> None:
+        objects = self.game_objects.values()
+        for i in range(len(objects) - 1, -1, -1):
+            obj = objects[i]
+            obj.update(self.timestep * FPS)
+            if obj.pos.x + world_size(obj.image)[0] < 0:
+                if isinstance(obj, Obstacle):
+                    self.despawn(obj.type)
+                self.remove(obj)
+
+    def despawn(self, obs_type: str) -> None:
+        if obs_type == 'chair':
+            self.lives -= 1
+            if self.lives <= 0:
+                self.over = True
+            self.events.append('fail')
+        elif obs_type == 'bottle':
+            self.score += self.scores['missed_bottle']
+            self.events.append('fail')
+
+    def collide(self) -> Obstacle | None:
+        return self.collision.query(self.player)
+
+    def add(self, obj: Obstacle, name: str | None = None) -> None:
+        if name is None:
+            self.game_objects.add(obj)
+        else:
+            old = self.game_objects.get(name)
+            self.game_objects[name] = obj
+            if old is not None:
+                self.release(old)
+        if obj.type:
+            self.collision.add(obj)
+
+    def remove(self, obj: GameObject) -> None:
+        self.game_objects.remove(obj)
+        self.release(obj)
+
+    def release(self, obj: GameObject) -> None:
+        if isinstance(obj, Obstacle):
+            if obj.type:
+                self.collision.remove(obj)
+            self.pool.release(obj)
+
+    def spawn_from(self, templates: tuple[Obstacle, ...]) -> None:
+        template = self.random.choice(templates)
+        self.add(self.pool.acquire(template.pos, template.image, template.type))
+
+    def schedule(self, kind: str, templates: tuple[Obstacle, ...]) -> None:
+        slot = self.slots[kind]
+        slot = self.slots[kind] = slot + max(rate_at(self.rates[kind], slot), self.timestep)
+        # slots count seconds from 1, so a rate of 2 first spawns a second in
+        self.scheduler.at(round((slot - 1) * FPS), lambda: self.spawn_due(kind, templates))
+
+    def spawn_due(self, kind: str, templates: tuple[Obstacle, ...]) -> None:
+        self.spawn_from(templates)
+        self.schedule(kind, templates)
+
+    def spawn(self) -> None:
+        self.scheduler.run(self.frame)
+
+    def action(self) -> None:
+        target = self.colliding
+        if self.over or target is None:
+            return
+        if target.type == 'chair' and self.chairs < self.max_values['chair']:
+            self.remove(target)
+            self.player.hold()
+            self.events.append('got')
+            if self.holding_name not in self.game_objects:
+                self.holding.pos.update(self.player.pos.x + world_size(self.player.image)[0], self.player.pos.y)
+                self.game_objects[self.holding_name] = self.holding
+            self.chairs += 1
+        elif target.type == 'bottle' and self.bottles < self.max_values['bottle']:
+            self.remove(target)
+            self.events.append('got')
+            self.bottles += 1
+        elif target.type == 'table' and self.holding_name in self.game_objects:
+            self.events.append('success')
+            self.score += self.scores['table']
+            self.chairs -= 1
+            self.chairs_flipped += 1
+            self.add(self.pool.acquire(target.pos, target.image, ''), 'table')
+            self.add(self.pool.acquire((target.pos.x - 4 * MULTIPLIER, target.pos.y - 18 * MULTIPLIER),
+                                       sprite_cache.get(self.holding.image, flip_y=True), ''), 'placed')
+            if self.chairs <= 0:
+                self.chairs = 0
+                self.player.place()
+                self.game_objects.remove(self.holding)
+            self.remove(target)
+        elif target.type == 'bin' and self.bottles > 0:
+            self.events.append('success')
+            self.score += self.scores['bottle'] * self.bottles
+            self.bottles_recycled += self.bottles
+            self.bottles = 0
+        if target not in self.collision:
+            self.colliding = None
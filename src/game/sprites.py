@@ -0,0 +1,77 @@
+import weakref
+from collections import OrderedDict
+import pygame
+
+Variant = tuple[pygame.Surface, bool, bool, float, float]
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_pitch() * surface.get_height()
+
+
+class SpriteCache:
+    def __init__(self, limit: int = 8 * 2 ** 20) -> None:
+        self.limit = limit
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.surfaces: OrderedDict[Variant, pygame.Surface] = OrderedDict()
+        self.live: weakref.WeakValueDictionary[Variant, pygame.Surface] = weakref.WeakValueDictionary()
+
+    def __len__(self) -> int:
+        return len(self.surfaces)
+
+    def get(self, image: pygame.Surface, flip_x: bool = False, flip_y: bool = False, angle: float = 0,
+            scale: float = 1) -> pygame.Surface:
+        if not (flip_x or flip_y or angle) and scale == 1:
+            return image
+        key = (image, flip_x, flip_y, angle, scale)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = self.live.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = image
+            if flip_x or flip_y:
+                surface = pygame.transform.flip(surface, flip_x, flip_y)
+            if angle:
+                surface = pygame.transform.rotate(surface, angle)
+            if scale != 1:
+                surface = pygame.transform.scale(surface, (round(surface.get_width() * scale),
+                                                           round(surface.get_height() * scale)))
+            self.live[key] = surface
+        else:
+            self.hits += 1
+        self.surfaces[key] = surface
+        self.size += surface_bytes(surface)
+        while self.size > self.limit and len(self.surfaces) > 1:
+            self.size -= surface_bytes(self.surfaces.popitem(last=False)[1])
+        return surface
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+        self.size = 0
+
+
+class MaskCache:
+    def __init__(self) -> None:
+        self.shapes: weakref.WeakKeyDictionary[pygame.Surface, tuple[pygame.mask.Mask, pygame.Rect]] = \
+            weakref.WeakKeyDictionary()
+
+    def __len__(self) -> int:
+        return len(self.shapes)
+
+    def get(self, image: pygame.Surface) -> tuple[pygame.mask.Mask, pygame.Rect]:
+        shape = self.shapes.get(image)
+        if shape is None:
+            mask = pygame.mask.from_surface(image)
+            rects = mask.get_bounding_rects()
+            self.shapes[image] = shape = mask, rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+        return shape
+
+
+sprite_cache = SpriteCache()
+mask_cache = MaskCache()
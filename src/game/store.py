@@ -0,0 +1,139 @@
+from typing import Iterable
+import numpy as np
+import pygame
+from config import WIDTH, HEIGHT
+from .game_object import world_size
+from .obstacle import Obstacle
+
+TYPES = ('', 'chair', 'bottle', 'table', 'bin')
+
+
+class EntityStore:
+    columns = ('x', 'y', 'velocity', 'width', 'height', 'hitbox_x', 'hitbox_y', 'hitbox_w', 'hitbox_h', 'kind',
+               'sprite')
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.velocity = np.zeros(capacity)
+        self.width = np.zeros(capacity)
+        self.height = np.zeros(capacity)
+        self.hitbox_x = np.zeros(capacity)
+        self.hitbox_y = np.zeros(capacity)
+        self.hitbox_w = np.zeros(capacity)
+        self.hitbox_h = np.zeros(capacity)
+        self.kind = np.zeros(capacity, np.int8)
+        self.sprite = np.zeros(capacity, np.int16)
+        self.sprites: list[pygame.Surface] = []
+        self.sprite_ids: dict[pygame.Surface, int] = {}
+        self.drawn_rect: pygame.Rect | None = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def grow(self) -> None:
+        for column in self.columns:
+            array = getattr(self, column)
+            setattr(self, column, np.concatenate((array, np.zeros_like(array))))
+
+    def sprite_id(self, image: pygame.Surface) -> int:
+        if image not in self.sprite_ids:
+            self.sprite_ids[image] = len(self.sprites)
+            self.sprites.append(image)
+        return self.sprite_ids[image]
+
+    def add(self, template: Obstacle, x: float | None = None) -> int:
+        if self.count == len(self.x):
+            self.grow()
+        i = self.count
+        self.count += 1
+        self.x[i] = template.pos.x if x is None else x
+        self.y[i] = template.pos.y
+        self.velocity[i] = template.velocity
+        self.width[i], self.height[i] = world_size(template.image)
+        self.hitbox_x[i], self.hitbox_y[i], self.hitbox_w[i], self.hitbox_h[i] = template.hitbox
+        self.kind[i] = TYPES.index(template.type)
+        self.sprite[i] = self.sprite_id(template.image)
+        return i
+
+    def remove(self, i: int) -> None:
+        self.count -= 1
+        last = self.count
+        if i != last:
+            for column in self.columns:
+                array = getattr(self, column)
+                array[i] = array[last]
+
+    def compact(self, keep: np.ndarray) -> None:
+        n = int(keep.sum())
+        for column in self.columns:
+            array = getattr(self, column)
+            array[:n] = array[:self.count][keep]
+        self.count = n
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def get_type(self, i: int) -> str:
+        return TYPES[self.kind[i]]
+
+    def get_image(self, i: int) -> pygame.Surface:
+        return self.sprites[self.sprite[i]]
+
+    def get_pos(self, i: int) -> tuple[float, float]:
+        return float(self.x[i]), float(self.y[i])
+
+    def update(self, delta_time: float) -> None:
+        n = self.count
+        self.x[:n] -= self.velocity[:n] * delta_time
+
+    def cull(self) -> list[str]:
+        n = self.count
+        gone = self.x[:n] + self.width[:n] < 0
+        if not gone.any():
+            return []
+        types = [TYPES[kind] for kind in self.kind[:n][gone]]
+        self.compact(~gone)
+        return types
+
+    def overlap(self, rect: pygame.Rect, types: Iterable[str] = TYPES) -> list[int]:
+        n = self.count
+        left = (self.x[:n] + self.hitbox_x[:n]).astype(np.int64)
+        top = (self.y[:n] + self.hitbox_y[:n]).astype(np.int64)
+        hits = np.flatnonzero((left < rect.right) & (left + self.hitbox_w[:n] > rect.left)
+                              & (top < rect.bottom) & (top + self.hitbox_h[:n] > rect.top)
+                              & np.isin(self.kind[:n], [TYPES.index(obs_type) for obs_type in types]))
+        return hits[np.argsort(left[hits], kind='stable')].tolist()
+
+    def visible(self) -> np.ndarray:
+        n = self.count
+        return np.flatnonzero((self.x[:n] < WIDTH) & (self.x[:n] + self.width[:n] > 0))
+
+    def get_rect(self, visible: np.ndarray | None = None) -> pygame.Rect:
+        if visible is None:
+            visible = self.visible()
+        if not len(visible):
+            return pygame.Rect(0, 0, 0, 0)
+        x, y = self.x[visible], self.y[visible]
+        left = int(x.min())
+        top = int(y.min())
+        rect = pygame.Rect(left, top, int((x + self.width[visible]).max()) + 1 - left,
+                           int((y + self.height[visible]).max()) + 1 - top)
+        return rect.clip(0, 0, WIDTH, HEIGHT)
+
+    def get_dirty_rects(self) -> list[pygame.Rect]:
+        rect = self.get_rect()
+        rects = [] if self.drawn_rect is None else [self.drawn_rect]
+        if rect:
+            rects.append(rect)
+        else:
+            self.drawn_rect = None
+        return rects
+
+    def submit(self, blits: list[tuple[pygame.Surface, pygame.Rect]]) -> None:
+        visible = self.visible()
+        sprites = self.sprites
+        blits.extend((sprites[sprite], (x, y)) for sprite, x, y in
+                     zip(self.sprite[visible].tolist(), self.x[visible].tolist(), self.y[visible].tolist()))
+        self.drawn_rect = self.get_rect(visible) or None
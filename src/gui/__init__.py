@@ -1,2 +1,7 @@
 from .gui_object import GuiObject
 from .button import Button
+from .text import TextCache, Label, text_cache
+from .hud import Hud
+from .widgets import Widgets
+from .scenes import SceneCache
+from .cursor import set_cursor
@@ -1,8 +1,11 @@
 import pygame
+from .cursor import set_cursor
 from .gui_object import GuiObject
 
 
 class Button(GuiObject):
+    interactive = True
+
     def __init__(self,
                  pos: tuple[float, float],
                  image: pygame.Surface,
@@ -11,12 +14,16 @@ class Button(GuiObject):
         self.original_image = image
         self.pressed_image = pressed_image
 
+    def reset(self) -> None:
+        super().reset()
+        self.image = self.original_image
+
     def hover(self) -> None:
-        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_HAND)
+        set_cursor(pygame.SYSTEM_CURSOR_HAND)
 
     def after_hover(self) -> None:
         self.image = self.original_image
-        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+        set_cursor(pygame.SYSTEM_CURSOR_ARROW)
 
     def click(self) -> None:
         self.image = self.pressed_image
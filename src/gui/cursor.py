@@ -0,0 +1,14 @@
+import pygame
+
+current: int | None = None
+
+
+def set_cursor(cursor: int) -> None:
+    global current
+    if cursor == current:
+        return
+    current = cursor
+    try:
+        pygame.mouse.set_cursor(cursor)
+    except pygame.error:
+        pass
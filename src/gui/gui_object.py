@@ -2,14 +2,35 @@ import pygame
 
 
 class GuiObject:
+    interactive = False
+
     def __init__(self,
                  pos: tuple[float, float],
                  image: pygame.Surface) -> None:
         self.pos = pygame.Vector2(*pos)
         self.image = image
+        self.drawn_rect: pygame.Rect | None = None
+        self.drawn_image: pygame.Surface | None = None
+
+    def get_rect(self) -> pygame.Rect:
+        return self.image.get_rect(topleft=self.pos)
+
+    def get_dirty_rects(self) -> list[pygame.Rect]:
+        rect = self.get_rect()
+        if self.drawn_rect is None:
+            return [rect]
+        if self.image is self.drawn_image and rect == self.drawn_rect:
+            return []
+        return [self.drawn_rect, rect]
+
+    def submit(self, blits: list[tuple[pygame.Surface, pygame.Rect]]) -> None:
+        self.drawn_rect = self.get_rect()
+        self.drawn_image = self.image
+        blits.append((self.image, self.drawn_rect))
 
-    def draw(self, surface: pygame.Surface) -> None:
-        surface.blit(self.image, self.pos)
+    def reset(self) -> None:
+        self.drawn_rect = None
+        self.drawn_image = None
 
     def hover(self) -> None:
         pass
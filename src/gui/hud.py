@@ -0,0 +1,36 @@
+import pygame
+from .gui_object import GuiObject
+from .text import Label
+
+
+class Hud(GuiObject):
+    def __init__(self, labels: dict[str, Label]) -> None:
+        self.labels = labels
+        self.composed: list[tuple[pygame.Surface, pygame.Rect]] = []
+        super().__init__((0, 0), pygame.Surface((0, 0), pygame.SRCALPHA))
+        self.refresh()
+
+    def __getitem__(self, name: str) -> Label:
+        return self.labels[name]
+
+    def refresh(self) -> None:
+        for label in self.labels.values():
+            label.refresh()
+        state = [(label.image, label.get_rect()) for label in self.labels.values()]
+        if state != self.composed:
+            self.compose(state)
+
+    def compose(self, state: list[tuple[pygame.Surface, pygame.Rect]]) -> None:
+        self.composed = state
+        bounds = state[0][1].unionall([rect for _, rect in state[1:]])
+        self.image = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        self.image.blits([(image, rect.move(-bounds.x, -bounds.y)) for image, rect in state], False)
+        self.pos.update(bounds.topleft)
+
+    def get_dirty_rects(self) -> list[pygame.Rect]:
+        self.refresh()
+        return super().get_dirty_rects()
+
+    def submit(self, blits: list[tuple[pygame.Surface, pygame.Rect]]) -> None:
+        self.refresh()
+        super().submit(blits)
@@ -0,0 +1,76 @@
+import time
+from collections import deque
+from typing import Callable, Generator, Hashable
+from .widgets import Widgets
+
+Build = Callable[[], Widgets | Generator[None, None, Widgets]]
+
+
+def finish(steps: Generator[None, None, Widgets]) -> Widgets:
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+class SceneCache:
+    def __init__(self, budget: float = 0.001) -> None:
+        self.budget = budget
+        self.scenes: dict[Hashable, Widgets] = {}
+        self.pending: deque[tuple[Hashable, Build]] = deque()
+        self.building: tuple[Hashable, Generator[None, None, Widgets]] | None = None
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.scenes
+
+    def store(self, key: Hashable, widgets: Widgets) -> Widgets:
+        self.scenes[key] = widgets
+        widgets.build()
+        return widgets
+
+    def get(self, key: Hashable, build: Build) -> Widgets:
+        widgets = self.scenes.get(key)
+        if widgets is not None:
+            for obj in widgets.values():
+                obj.reset()
+            return widgets
+        if self.building is not None and self.building[0] == key:
+            steps = self.building[1]
+            self.building = None
+        else:
+            steps = build()
+        return self.store(key, finish(steps) if isinstance(steps, Generator) else steps)
+
+    def preload(self, key: Hashable, build: Build) -> None:
+        if key not in self.scenes:
+            self.pending.append((key, build))
+
+    def idle(self) -> None:
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            if self.building is None:
+                if not self.pending:
+                    return
+                key, build = self.pending.popleft()
+                if key in self.scenes:
+                    continue
+                steps = build()
+                if not isinstance(steps, Generator):
+                    self.store(key, steps)
+                    continue
+                self.building = key, steps
+            key, steps = self.building
+            try:
+                next(steps)
+            except StopIteration as stop:
+                self.building = None
+                self.store(key, stop.value)
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        if self.building is not None and key in (None, self.building[0]):
+            self.building = None
+        if key is None:
+            self.scenes.clear()
+        else:
+            self.scenes.pop(key, None)
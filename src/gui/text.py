@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from typing import Any, Callable
+import pygame
+from .gui_object import GuiObject
+
+
+class TextCache:
+    def __init__(self, size: int = 256) -> None:
+        self.size = size
+        self.surfaces: OrderedDict[tuple[pygame.font.Font, str, tuple[int, ...]], pygame.Surface] = OrderedDict()
+
+    def render(self, font: pygame.font.Font, text: str,
+               color: tuple[int, int, int] | pygame.Color = (255, 255, 255)) -> pygame.Surface:
+        key = (font, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = font.render(text, True, color)
+            if len(self.surfaces) > self.size:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+
+
+text_cache = TextCache()
+
+
+class Label(GuiObject):
+    def __init__(self,
+                 pos: tuple[float, float],
+                 font: pygame.font.Font,
+                 value: Callable[[], Any],
+                 fmt: str = '{}',
+                 color: tuple[int, int, int] | pygame.Color = (255, 255, 255),
+                 anchor: str = 'topleft',
+                 cache: TextCache = text_cache) -> None:
+        self.font = font
+        self.value = value
+        self.fmt = fmt
+        self.color = color
+        self.anchor = anchor
+        self.anchor_pos = pygame.Vector2(*pos)
+        self.cache = cache
+        self.last_value = value()
+        super().__init__(pos, cache.render(font, fmt.format(self.last_value), color))
+        self.align()
+
+    def align(self) -> None:
+        rect = self.image.get_rect(**{self.anchor: self.anchor_pos})
+        self.pos.update(rect.topleft)
+
+    def move(self, pos: tuple[float, float] | pygame.Vector2) -> None:
+        if self.anchor_pos != pos:
+            self.anchor_pos.update(pos)
+            self.align()
+
+    def refresh(self) -> None:
+        value = self.value()
+        if value != self.last_value:
+            self.last_value = value
+            self.image = self.cache.render(self.font, self.fmt.format(value), self.color)
+            self.align()
+
+    def get_dirty_rects(self) -> list[pygame.Rect]:
+        self.refresh()
+        return super().get_dirty_rects()
+
+    def submit(self, blits: list[tuple[pygame.Surface, pygame.Rect]]) -> None:
+        self.refresh()
+        super().submit(blits)
@@ -0,0 +1,58 @@
+import pygame
+from .gui_object import GuiObject
+
+
+class Widgets(dict[str, GuiObject]):
+    cell = 128
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.grid: dict[tuple[int, int], list[tuple[pygame.Rect, GuiObject]]] | None = None
+
+    def __setitem__(self, name: str, obj: GuiObject) -> None:
+        super().__setitem__(name, obj)
+        self.grid = None
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self.grid = None
+
+    def pop(self, *args) -> GuiObject:
+        self.grid = None
+        return super().pop(*args)
+
+    def popitem(self) -> tuple[str, GuiObject]:
+        self.grid = None
+        return super().popitem()
+
+    def setdefault(self, name: str, obj: GuiObject) -> GuiObject:
+        self.grid = None
+        return super().setdefault(name, obj)
+
+    def update(self, *args, **kwargs) -> None:
+        self.grid = None
+        super().update(*args, **kwargs)
+
+    def clear(self) -> None:
+        self.grid = None
+        super().clear()
+
+    def build(self) -> None:
+        cell = self.cell
+        self.grid = {}
+        for obj in self.values():
+            if not obj.interactive:
+                continue
+            rect = obj.get_rect()
+            for x in range(rect.left // cell, (rect.right - 1) // cell + 1):
+                for y in range(rect.top // cell, (rect.bottom - 1) // cell + 1):
+                    self.grid.setdefault((x, y), []).append((rect, obj))
+
+    def hit(self, pos: tuple[int, int]) -> GuiObject | None:
+        if self.grid is None:
+            self.build()
+        x, y = pos
+        for rect, obj in self.grid.get((x // self.cell, y // self.cell), ()):
+            if rect.left < x < rect.right and rect.top < y < rect.bottom:
+                return obj
+        return None
@@ -0,0 +1,81 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Iterable
+
+
+class Leaderboard:
+    def __init__(self, path: str = 'highscore.db', legacy_path: str | None = 'highscore') -> None:
+        self.path = path
+        new = not os.path.exists(path)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS scores (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                submitted REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+            CREATE TABLE IF NOT EXISTS best (
+                name TEXT PRIMARY KEY,
+                score INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS best_by_score ON best (score DESC);
+        ''')
+        self.connection.commit()
+        self.high_score = self.query_high_score()
+        if new and legacy_path is not None:
+            self.import_legacy(legacy_path)
+
+    def import_legacy(self, path: str) -> None:
+        try:
+            with open(path) as f:
+                entries = json.load(f)
+        except (FileNotFoundError, OSError, ValueError):
+            return
+        self.submit_many((name, int(score)) for name, score in entries)
+
+    def submit(self, name: str, score: int) -> None:
+        self.submit_many(((name, score),))
+
+    def submit_many(self, entries: Iterable[tuple[str, int]]) -> None:
+        now = time.time()
+        entries = [(name, int(score), now) for name, score in entries]
+        with self.connection:
+            self.connection.executemany('INSERT INTO scores (name, score, submitted) VALUES (?, ?, ?)', entries)
+            self.connection.executemany('''
+                INSERT INTO best (name, score) VALUES (?, ?)
+                ON CONFLICT (name) DO UPDATE SET score = excluded.score WHERE excluded.score > best.score
+            ''', ((name, score) for name, score, _ in entries))
+        for _, score, _ in entries:
+            if self.high_score is None or score > self.high_score:
+                self.high_score = score
+
+    def query_high_score(self) -> int | None:
+        row = self.connection.execute('SELECT score FROM scores ORDER BY score DESC LIMIT 1').fetchone()
+        return None if row is None else row[0]
+
+    def top(self, limit: int = 10, offset: int = 0) -> list[tuple[str, int]]:
+        return self.connection.execute('SELECT name, score FROM scores ORDER BY score DESC, id LIMIT ? OFFSET ?',
+                                       (limit, offset)).fetchall()
+
+    def page(self, page: int, size: int = 10) -> list[tuple[str, int]]:
+        return self.top(size, page * size)
+
+    def top_players(self, limit: int = 10, offset: int = 0) -> list[tuple[str, int]]:
+        return self.connection.execute('SELECT name, score FROM best ORDER BY score DESC LIMIT ? OFFSET ?',
+                                       (limit, offset)).fetchall()
+
+    def best(self, name: str) -> int | None:
+        row = self.connection.execute('SELECT score FROM best WHERE name = ?', (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def count(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM scores').fetchone()[0]
+
+    def close(self) -> None:
+        self.connection.close()
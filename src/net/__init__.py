@@ -0,0 +1,3 @@
+from .protocol import SpriteTable, State
+from .server import Server
+from .client import Client, connect
@@ -0,0 +1,181 @@
+import asyncio
+import struct
+import time
+from collections import deque
+from config import FPS, NET_INTERPOLATION, NET_TIMEOUT, max_values
+from .protocol import HEADER, WELCOME_BODY, INPUT_BODY, SNAPSHOT_BODY, VERSION, HELLO, WELCOME, INPUT, SNAPSHOT, \
+    BYE, HISTORY, TEAM, SEATS, State, decode_delta
+
+HELLO_INTERVAL = 0.5
+
+
+def predict(seat: tuple[int, ...], obs_type: str) -> tuple[tuple[int, ...], bool]:
+    x, chairs, bottles = seat
+    if obs_type == 'chair' and chairs < max_values['chair']:
+        return (x, chairs + 1, bottles), True
+    if obs_type == 'bottle' and bottles < max_values['bottle']:
+        return (x, chairs, bottles + 1), True
+    if obs_type == 'table' and chairs > 0:
+        return (x, chairs - 1, bottles), False
+    if obs_type == 'bin' and bottles > 0:
+        return (x, chairs, 0), False
+    return seat, False
+
+
+class Client(asyncio.DatagramProtocol):
+    def __init__(self, interpolation: float = NET_INTERPOLATION, timeout: float = NET_TIMEOUT) -> None:
+        self.delay = interpolation * FPS
+        self.timeout = timeout
+        self.transport: asyncio.DatagramTransport | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.seat: int | None = None
+        self.states: dict[int, State] = {}
+        self.latest = 0
+        self.received = 0.0
+        self.seq = 0
+        self.pending: dict[int, tuple[float, int | None, str]] = {}
+        self.latencies: deque[float] = deque(maxlen=600)
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.started = self.heard = time.perf_counter()
+        self.hello = 0.0
+        self.closed = False
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.closed = True
+
+    def error_received(self, exc: Exception) -> None:
+        pass
+
+    def send(self, data: bytes) -> None:
+        self.transport.sendto(data)
+        self.bytes_sent += len(data)
+
+    def datagram_received(self, data: bytes, address: tuple) -> None:
+        try:
+            kind, version = HEADER.unpack_from(data)
+        except struct.error:
+            return
+        if version != VERSION:
+            return
+        self.bytes_received += len(data)
+        self.heard = now = time.perf_counter()
+        if kind == WELCOME:
+            (self.seat,) = WELCOME_BODY.unpack_from(data, HEADER.size)
+        elif kind == SNAPSHOT:
+            frame, baseline, acked, self.seat = SNAPSHOT_BODY.unpack_from(data, HEADER.size)
+            if frame <= self.latest:
+                return
+            if baseline:
+                if baseline not in self.states:
+                    return
+                state, _ = decode_delta(data, HEADER.size + SNAPSHOT_BODY.size, self.states[baseline])
+            else:
+                state, _ = decode_delta(data, HEADER.size + SNAPSHOT_BODY.size, {})
+            self.states[frame] = state
+            while len(self.states) > HISTORY:
+                del self.states[next(iter(self.states))]
+            self.latest = frame
+            self.received = now
+            for seq in [seq for seq in self.pending if seq <= acked]:
+                self.latencies.append(now - self.pending.pop(seq)[0])
+        elif kind == BYE:
+            self.closed = True
+
+    def update(self) -> None:
+        if self.closed or self.transport is None:
+            return
+        now = time.perf_counter()
+        if now - self.heard > self.timeout:
+            self.closed = True
+        elif self.seat is None:
+            if now - self.hello > HELLO_INTERVAL:
+                self.hello = now
+                self.send(HEADER.pack(HELLO, VERSION))
+        else:
+            self.send(HEADER.pack(INPUT, VERSION) + INPUT_BODY.pack(self.latest, self.seq))
+
+    def action(self, target: int | None = None, obs_type: str = '') -> None:
+        self.seq += 1
+        self.pending[self.seq] = (time.perf_counter(), target, obs_type)
+
+    def team(self) -> tuple[int, ...] | None:
+        return self.states[self.latest][TEAM] if self.states else None
+
+    def own(self) -> tuple[tuple[int, ...] | None, set[int]]:
+        if not self.states or self.seat is None or SEATS + self.seat not in self.states[self.latest]:
+            return None, set()
+        seat = self.states[self.latest][SEATS + self.seat]
+        hidden = set()
+        for _, target, obs_type in self.pending.values():
+            seat, removed = predict(seat, obs_type)
+            if removed:
+                hidden.add(target)
+        return seat, hidden
+
+    def view(self) -> State:
+        if not self.states:
+            return {}
+        render = self.latest + (time.perf_counter() - self.received) * FPS - self.delay
+        older = newer = None
+        for frame in self.states:
+            if frame > render:
+                newer = frame
+                break
+            older = frame
+        if older is None or newer is None:
+            state = dict(self.states[older if newer is None else newer])
+        else:
+            a, b, t = self.states[older], self.states[newer], (render - older) / (newer - older)
+            state = {}
+            for key, values in a.items():
+                other = b.get(key)
+                if key >= SEATS and other is not None:
+                    values = (round(values[0] + (other[0] - values[0]) * t), *values[1:])
+                state[key] = values
+        state[TEAM] = self.team()
+        seat, hidden = self.own()
+        if seat is not None:
+            state[SEATS + self.seat] = seat
+        for key in hidden:
+            state.pop(key, None)
+        return state
+
+    def stats(self) -> dict[str, float]:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        latencies = sorted(self.latencies)
+        return {
+            'sent_bytes_per_s': self.bytes_sent / elapsed,
+            'received_bytes_per_s': self.bytes_received / elapsed,
+            'latency_p50_ms': latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+            'latency_p99_ms': latencies[min(len(latencies) - 1, round(len(latencies) * 0.99))] * 1000
+            if latencies else 0.0,
+        }
+
+    def poll(self) -> None:
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+
+    def close(self) -> None:
+        if self.transport is not None and not self.transport.is_closing():
+            if self.seat is not None:
+                self.send(HEADER.pack(BYE, VERSION))
+            self.transport.close()
+        if self.loop is not None:
+            self.poll()
+            self.loop.close()
+            self.loop = None
+
+
+def connect(host: str, port: int, **kwargs) -> Client:
+    client = Client(**kwargs)
+    client.loop = asyncio.new_event_loop()
+    try:
+        client.loop.run_until_complete(client.loop.create_datagram_endpoint(lambda: client, remote_addr=(host, port)))
+    except OSError:
+        client.loop.close()
+        raise
+    return client
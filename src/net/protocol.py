@@ -0,0 +1,105 @@
+import struct
+import pygame
+from game import sprite_cache
+from game.replay import read_varint, write_varint
+from resources import FLIPPED
+
+VERSION = 1
+HEADER = struct.Struct('<BB')
+WELCOME_BODY = struct.Struct('<B')
+INPUT_BODY = struct.Struct('<II')
+SNAPSHOT_BODY = struct.Struct('<IIIB')
+
+HELLO = 0
+WELCOME = 1
+INPUT = 2
+SNAPSHOT = 3
+BYE = 4
+
+MAX_SEATS = 8
+MAX_ACTIONS = 64
+HISTORY = 64
+
+# snapshot entity keys: the team, then one per seat, then obstacles
+TEAM = 0
+SEATS = 1
+OBSTACLES = SEATS + MAX_SEATS
+
+State = dict[int, tuple[int, ...]]
+
+
+def zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def unzigzag(value: int) -> int:
+    return -(value >> 1) - 1 if value & 1 else value >> 1
+
+
+def encode_delta(out: bytearray, state: State, baseline: State) -> None:
+    changed = []
+    for key, values in state.items():
+        old = baseline.get(key)
+        if old is None or len(old) != len(values):
+            changed.append((key, 0, values))
+            continue
+        mask = 0
+        deltas = []
+        for i, (new, was) in enumerate(zip(values, old)):
+            if new != was:
+                mask |= 1 << i
+                deltas.append(new - was)
+        if mask:
+            changed.append((key, mask, deltas))
+    removed = [key for key in baseline if key not in state]
+    write_varint(out, len(changed))
+    for key, mask, values in changed:
+        write_varint(out, key)
+        write_varint(out, mask)
+        if not mask:
+            write_varint(out, len(values))
+        for value in values:
+            write_varint(out, zigzag(value))
+    write_varint(out, len(removed))
+    for key in removed:
+        write_varint(out, key)
+
+
+def decode_delta(data: bytes, i: int, baseline: State) -> tuple[State, int]:
+    state = dict(baseline)
+    count, i = read_varint(data, i)
+    for _ in range(count):
+        key, i = read_varint(data, i)
+        mask, i = read_varint(data, i)
+        if not mask:
+            length, i = read_varint(data, i)
+            values = []
+            for _ in range(length):
+                value, i = read_varint(data, i)
+                values.append(unzigzag(value))
+        else:
+            values = list(state[key])
+            field = 0
+            while mask:
+                if mask & 1:
+                    value, i = read_varint(data, i)
+                    values[field] += unzigzag(value)
+                mask >>= 1
+                field += 1
+        state[key] = tuple(values)
+    count, i = read_varint(data, i)
+    for _ in range(count):
+        key, i = read_varint(data, i)
+        state.pop(key, None)
+    return state, i
+
+
+class SpriteTable:
+    def __init__(self, assets: dict[str, pygame.Surface]) -> None:
+        self.images = [assets[name] for name in sorted(assets)]
+        self.images += [assets[f'{name}2'] for name in FLIPPED]
+        self.images.append(sprite_cache.get(assets['obstacle_chair_side2'], flip_y=True))
+        self.codes = {image: code for code, image in enumerate(self.images)}
+
+    def code(self, image: pygame.Surface) -> int:
+        return self.codes[image]
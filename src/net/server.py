@@ -0,0 +1,171 @@
+import asyncio
+import struct
+from collections import deque
+import pygame
+from config import MULTIPLIER, NET_SNAPSHOT_RATE, NET_TIMEOUT, FPS, WIDTH, rates, max_values
+from game import MultiplayerSimulation, Obstacle, Rate
+from game.store import TYPES
+from resources import build_obstacles, create_ground, create_player
+from .protocol import HEADER, WELCOME_BODY, INPUT_BODY, SNAPSHOT_BODY, VERSION, HELLO, WELCOME, INPUT, SNAPSHOT, \
+    BYE, MAX_SEATS, MAX_ACTIONS, HISTORY, TEAM, SEATS, OBSTACLES, State, SpriteTable, encode_delta
+
+SEAT_SPACING = 30 * MULTIPLIER
+
+
+class Peer:
+    __slots__ = ('address', 'seat', 'ack', 'queued', 'applied', 'actions', 'seen', 'bytes_sent', 'bytes_received')
+
+    def __init__(self, address: tuple, seat: int, now: float) -> None:
+        self.address = address
+        self.seat = seat
+        self.ack = 0
+        self.queued = 0
+        self.applied = 0
+        self.actions: deque[int] = deque()
+        self.seen = now
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+def capture(sim: MultiplayerSimulation, sprites: SpriteTable) -> State:
+    state = {TEAM: (sim.score, sim.lives, int(sim.over), sim.chairs_flipped, sim.bottles_recycled)}
+    for seat in sim.seats.values():
+        state[SEATS + seat.id] = (round(seat.player.pos.x), seat.chairs, seat.bottles)
+    for obj in sim.game_objects:
+        if isinstance(obj, Obstacle):
+            state[OBSTACLES + sim.entity_id(obj)] = (round(obj.pos.x), round(obj.pos.y), sprites.code(obj.image),
+                                                     TYPES.index(obj.type))
+    return state
+
+
+class Server(asyncio.DatagramProtocol):
+    def __init__(self, assets: dict[str, pygame.Surface], seed: int | None = None,
+                 sim_rates: dict[str, Rate] = rates, snapshot_rate: float = NET_SNAPSHOT_RATE,
+                 timeout: float = NET_TIMEOUT) -> None:
+        self.assets = assets
+        self.seed = seed
+        self.rates = sim_rates
+        self.sprites = SpriteTable(assets)
+        self.obstacles, self.recycle_obs = build_obstacles(assets)
+        self.interval = max(1, round(FPS / snapshot_rate))
+        self.timeout = timeout
+        self.sim: MultiplayerSimulation | None = None
+        self.peers: dict[tuple, Peer] = {}
+        self.history: dict[int, State] = {}
+        self.transport: asyncio.DatagramTransport | None = None
+        self.running = False
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        self.transport = transport
+
+    def send(self, peer: Peer, data: bytes) -> None:
+        self.transport.sendto(data, peer.address)
+        peer.bytes_sent += len(data)
+
+    def now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def datagram_received(self, data: bytes, address: tuple) -> None:
+        try:
+            kind, version = HEADER.unpack_from(data)
+        except struct.error:
+            return
+        if version != VERSION:
+            return
+        peer = self.peers.get(address)
+        if kind == HELLO and peer is None:
+            peer = self.join(address)
+            if peer is None:
+                self.transport.sendto(HEADER.pack(BYE, VERSION), address)
+                return
+        elif peer is None:
+            return
+        peer.seen = self.now()
+        peer.bytes_received += len(data)
+        if kind == HELLO:
+            self.send(peer, HEADER.pack(WELCOME, VERSION) + WELCOME_BODY.pack(peer.seat))
+        elif kind == INPUT:
+            try:
+                peer.ack, seq = INPUT_BODY.unpack_from(data, HEADER.size)
+            except struct.error:
+                return
+            for _ in range(min(seq - peer.queued, MAX_ACTIONS)):
+                peer.queued += 1
+                peer.actions.append(peer.queued)
+        elif kind == BYE:
+            self.leave(peer)
+
+    def join(self, address: tuple) -> Peer | None:
+        if self.sim is not None and self.sim.over:
+            for peer in list(self.peers.values()):
+                self.send(peer, HEADER.pack(BYE, VERSION))
+                self.leave(peer)
+        taken = {peer.seat for peer in self.peers.values()}
+        seat = next((seat for seat in range(MAX_SEATS) if seat not in taken), None)
+        if seat is None:
+            return None
+        player = create_player(self.assets, create_ground(), WIDTH / MULTIPLIER + seat * SEAT_SPACING)
+        if self.sim is None:
+            self.sim = MultiplayerSimulation(player, self.obstacles, self.recycle_obs,
+                                             self.assets['obstacle_chair_side2'], self.rates, max_values,
+                                             seed=self.seed, seat=seat)
+        else:
+            self.sim.join(seat, player)
+        peer = self.peers[address] = Peer(address, seat, self.now())
+        return peer
+
+    def leave(self, peer: Peer) -> None:
+        del self.peers[peer.address]
+        if self.sim is None:
+            return
+        if not self.peers:
+            self.sim = None
+            self.history.clear()
+        elif peer.seat in self.sim.seats:
+            self.sim.leave(peer.seat)
+
+    def tick(self) -> None:
+        now = self.now()
+        for peer in list(self.peers.values()):
+            if now - peer.seen > self.timeout:
+                self.leave(peer)
+        sim = self.sim
+        if sim is None:
+            return
+        sim.step()
+        for peer in self.peers.values():
+            while peer.actions:
+                peer.applied = peer.actions.popleft()
+                sim.action(peer.seat)
+        sim.events.clear()
+        if sim.frame % self.interval:
+            return
+
+        state = self.history[sim.frame] = capture(sim, self.sprites)
+        while len(self.history) > HISTORY:
+            del self.history[next(iter(self.history))]
+        bodies: dict[int, bytes] = {}
+        for peer in self.peers.values():
+            baseline = peer.ack if peer.ack in self.history else 0
+            if baseline not in bodies:
+                body = bytearray()
+                encode_delta(body, state, self.history.get(baseline, {}))
+                bodies[baseline] = bytes(body)
+            self.send(peer, HEADER.pack(SNAPSHOT, VERSION)
+                      + SNAPSHOT_BODY.pack(sim.frame, baseline, peer.applied, peer.seat) + bodies[baseline])
+
+    async def serve(self, host: str, port: int) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=(host, port))
+        self.running = True
+        next_tick = loop.time()
+        while self.running:
+            self.tick()
+            next_tick += 1 / FPS
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+        for peer in list(self.peers.values()):
+            self.send(peer, HEADER.pack(BYE, VERSION))
+        self.transport.close()
+
+    def stop(self) -> None:
+        self.running = False
@@ -0,0 +1,161 @@
+import csv
+import json
+import time
+from collections import deque
+from typing import TextIO
+import pygame
+from gui import GuiObject
+
+PHASES = ('events', 'update', 'spawn', 'hud', 'queue', 'blit_entities', 'blit_gui', 'flip', 'idle')
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, round(p / 100 * (len(values) - 1)))]
+
+
+class LatencyProbe:
+    def __init__(self, history: int = 600) -> None:
+        self.pending: deque[tuple[float, int]] = deque()
+        self.samples: deque[float] = deque(maxlen=history)
+
+    def applied(self, pressed: float, frame: int) -> None:
+        self.pending.append((pressed, frame))
+
+    def presented(self, frame: int) -> None:
+        now = time.perf_counter()
+        while self.pending and self.pending[0][1] <= frame:
+            self.samples.append((now - self.pending.popleft()[0]) * 1000)
+
+    def clear(self) -> None:
+        self.pending.clear()
+
+
+class Profiler:
+    def __init__(self, enabled: bool = False, output: str | None = None, history: int = 600) -> None:
+        self.enabled = enabled
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.frames: deque[float] = deque(maxlen=history)
+        self.samples: deque[dict[str, float]] = deque(maxlen=history)
+        self.latency = LatencyProbe(history)
+        self.frame = 0
+        self.frame_start = 0.0
+        self.last = 0.0
+        self.file: TextIO | None = None
+        self.writer: csv.DictWriter | None = None
+        if output is not None:
+            self.open(output)
+
+    def __bool__(self) -> bool:
+        return self.enabled
+
+    def open(self, path: str) -> None:
+        self.close()
+        self.file = open(path, 'w', newline='')
+        if path.endswith('.csv'):
+            self.writer = csv.DictWriter(self.file, ('frame', 'frame_ms', 'work_ms', *PHASES))
+            self.writer.writeheader()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+        self.file = None
+        self.writer = None
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+        self.frame_start = 0.0
+
+    def begin(self) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start:
+            self.frames.append((now - self.frame_start) * 1000)
+        self.frame_start = self.last = now
+        for phase in self.phases:
+            self.phases[phase] = 0.0
+
+    def lap(self, phase: str) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases[phase] += now - self.last
+        self.last = now
+
+    def end(self) -> None:
+        if not self.enabled:
+            return
+        self.frame += 1
+        sample = {phase: round(seconds * 1000, 4) for phase, seconds in self.phases.items()}
+        sample['work_ms'] = round((self.last - self.frame_start) * 1000, 4)
+        self.samples.append(sample)
+        if self.file is not None:
+            record = {'frame': self.frame, 'frame_ms': round(self.frames[-1], 4) if self.frames else 0, **sample}
+            if self.writer is not None:
+                self.writer.writerow(record)
+            else:
+                self.file.write(json.dumps(record) + '\n')
+
+    def summary(self) -> dict[str, float]:
+        frames = sorted(self.frames)
+        samples = list(self.samples)
+        latencies = sorted(self.latency.samples)
+        summary = {
+            'p50': percentile(frames, 50),
+            'p95': percentile(frames, 95),
+            'p99': percentile(frames, 99),
+        }
+        if latencies:
+            summary['input_p50'] = percentile(latencies, 50)
+            summary['input_p99'] = percentile(latencies, 99)
+        if samples:
+            for key in ('work_ms', *PHASES):
+                summary[key] = sum(sample[key] for sample in samples) / len(samples)
+        return summary
+
+
+class ProfilerOverlay(GuiObject):
+    def __init__(self, profiler: Profiler, font: pygame.font.Font, pos: tuple[float, float] = (0, 0),
+                 anchor: str = 'topleft', interval: int = 30, title: str = 'frame') -> None:
+        self.profiler = profiler
+        self.title = title
+        self.font = font
+        self.anchor = anchor
+        self.anchor_pos = pygame.Vector2(*pos)
+        self.interval = interval
+        self.refreshed = profiler.frame
+        super().__init__(pos, pygame.Surface((1, 1), pygame.SRCALPHA))
+        self.render()
+
+    def refresh(self) -> None:
+        if self.profiler.frame - self.refreshed >= self.interval:
+            self.refreshed = self.profiler.frame
+            self.render()
+
+    def render(self) -> None:
+        summary = self.profiler.summary()
+        lines = [f'{self.title} p50 {summary["p50"]:.1f}  p95 {summary["p95"]:.1f}  p99 {summary["p99"]:.1f} ms']
+        if 'input_p50' in summary:
+            lines.append(f'input p50 {summary["input_p50"]:.1f}  p99 {summary["input_p99"]:.1f} ms')
+        if 'work_ms' in summary:
+            lines.append(f'work {summary["work_ms"]:.2f} ms')
+            lines.extend(f'{phase} {summary[phase]:.2f}' for phase in PHASES)
+        rendered = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        self.image = pygame.Surface((max(text.get_width() for text in rendered) + 10,
+                                     sum(text.get_height() for text in rendered) + 10), pygame.SRCALPHA)
+        self.image.fill((0, 0, 0, 160))
+        y = 5
+        for text in rendered:
+            self.image.blit(text, (5, y))
+            y += text.get_height()
+        self.pos.update(self.image.get_rect(**{self.anchor: self.anchor_pos}).topleft)
+
+    def get_dirty_rects(self) -> list[pygame.Rect]:
+        self.refresh()
+        return super().get_dirty_rects()
+
+    def submit(self, blits: list[tuple[pygame.Surface, pygame.Rect]]) -> None:
+        self.refresh()
+        super().submit(blits)
@@ -0,0 +1,3 @@
+from .queue import RenderQueue, ENTITIES, HELD, GUI, OVERLAY, WORLD
+from .dirty import DirtyRenderer
+from .lowres import LowResRenderer
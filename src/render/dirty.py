@@ -0,0 +1,99 @@
+from typing import Iterable
+import pygame
+from game import GameObject
+from gui import GuiObject
+from .queue import RenderQueue
+
+Drawable = GameObject | GuiObject
+
+
+class DirtyRenderer:
+    max_rects = 16
+
+    def __init__(self, surface: pygame.Surface) -> None:
+        self.surface = surface
+        self.background: pygame.Surface | None = None
+        self.drawn: set[Drawable] = set()
+        self.marked: list[pygame.Rect] = []
+        self.full = True
+        self.queue = RenderQueue()
+        self.profiler = None
+
+    def invalidate(self) -> None:
+        self.full = True
+
+    def mark(self, *rects: pygame.Rect) -> None:
+        self.marked.extend(rects)
+
+    def collect(self, drawables: list[Drawable]) -> list[pygame.Rect]:
+        dirty = self.marked
+        self.marked = []
+        for obj in self.drawn.difference(drawables):
+            if obj.drawn_rect is not None:
+                dirty.append(obj.drawn_rect)
+            obj.drawn_rect = None
+            obj.drawn_image = None
+        for obj in drawables:
+            dirty.extend(obj.get_dirty_rects())
+        bounds = self.surface.get_rect()
+        dirty = [rect.clip(bounds) for rect in dirty]
+        return merge([rect for rect in dirty if rect.w and rect.h], self.max_rects)
+
+    def submit(self, layers: dict[int, list[Drawable]]) -> None:
+        self.queue.clear()
+        for layer, objects in layers.items():
+            blits = self.queue.layer(layer)
+            for obj in objects:
+                obj.submit(blits)
+        if self.profiler:
+            self.profiler.lap('queue')
+
+    def compose(self, color: pygame.Color | tuple[int, int, int], objects: Iterable[Drawable] = ()) -> pygame.Surface:
+        backdrop = pygame.Surface(self.surface.get_size()).convert()
+        backdrop.fill(color)
+        blits = []
+        for obj in objects:
+            obj.submit(blits)
+        backdrop.blits(blits, False)
+        return backdrop
+
+    def render(self, background: pygame.Surface, layers: dict[int, Iterable[Drawable]]) -> list[pygame.Rect]:
+        layers = {layer: list(objects) for layer, objects in layers.items()}
+        drawables = [obj for objects in layers.values() for obj in objects]
+        if self.background is not background:
+            self.background = background
+            self.full = True
+        if self.full:
+            self.marked = []
+            dirty = [self.surface.get_rect()]
+        else:
+            dirty = self.collect(drawables)
+        self.submit(layers)
+        self.full = False
+        for rect in dirty:
+            self.surface.set_clip(rect)
+            self.surface.blit(self.background, rect, rect)
+            self.queue.draw(self.surface, True)
+        if self.profiler:
+            self.profiler.lap('blit_entities')
+        for rect in dirty:
+            self.surface.set_clip(rect)
+            self.queue.draw(self.surface, False)
+        self.surface.set_clip(None)
+        if self.profiler:
+            self.profiler.lap('blit_gui')
+        self.drawn = set(drawables)
+        return dirty
+
+
+def merge(rects: list[pygame.Rect], limit: int) -> list[pygame.Rect]:
+    merged: list[pygame.Rect] = []
+    for rect in rects:
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect = rect.union(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    if len(merged) > limit:
+        return [merged[0].unionall(merged[1:])]
+    return merged
@@ -0,0 +1,38 @@
+from typing import Iterable
+import pygame
+from config import WORLD_SCALE
+from .dirty import DirtyRenderer, Drawable
+from .queue import WORLD
+
+
+class LowResRenderer(DirtyRenderer):
+    def __init__(self, surface: pygame.Surface, scale: int = WORLD_SCALE) -> None:
+        super().__init__(surface)
+        self.scale = scale
+        self.target = pygame.Surface((surface.get_width() // scale, surface.get_height() // scale)).convert()
+
+    def compose(self, color: pygame.Color | tuple[int, int, int], objects: Iterable[Drawable] = ()) -> pygame.Surface:
+        backdrop = pygame.Surface(self.target.get_size()).convert()
+        backdrop.fill(color)
+        blits = []
+        for obj in objects:
+            obj.submit(blits)
+        backdrop.blits([(image, (dest[0] // self.scale, dest[1] // self.scale)) for image, dest in blits], False)
+        return backdrop
+
+    def render(self, background: pygame.Surface, layers: dict[int, Iterable[Drawable]]) -> list[pygame.Rect]:
+        self.full = False
+        self.marked = []
+        self.submit({layer: list(objects) for layer, objects in layers.items()})
+        scale = self.scale
+        self.target.blit(background, (0, 0))
+        for layer, blits in self.queue.layers.items():
+            if layer in WORLD and blits:
+                self.target.blits([(image, (dest[0] // scale, dest[1] // scale)) for image, dest in blits], False)
+        pygame.transform.scale(self.target, self.surface.get_size(), self.surface)
+        if self.profiler:
+            self.profiler.lap('blit_entities')
+        self.queue.draw(self.surface, False)
+        if self.profiler:
+            self.profiler.lap('blit_gui')
+        return [self.surface.get_rect()]
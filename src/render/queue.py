@@ -0,0 +1,34 @@
+import pygame
+
+ENTITIES = 0
+HELD = 1
+GUI = 2
+OVERLAY = 3
+WORLD = (ENTITIES, HELD)
+
+Blit = tuple[pygame.Surface, pygame.Rect | tuple[float, float]]
+
+
+class RenderQueue:
+    __slots__ = ('layers',)
+
+    def __init__(self) -> None:
+        self.layers: dict[int, list[Blit]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(blits) for blits in self.layers.values())
+
+    def layer(self, layer: int) -> list[Blit]:
+        if layer not in self.layers:
+            self.layers[layer] = []
+            self.layers = dict(sorted(self.layers.items()))
+        return self.layers[layer]
+
+    def draw(self, surface: pygame.Surface, world: bool | None = None) -> None:
+        for layer, blits in self.layers.items():
+            if blits and (world is None or (layer in WORLD) == world):
+                surface.blits(blits, False)
+
+    def clear(self) -> None:
+        for blits in self.layers.values():
+            blits.clear()
@@ -0,0 +1,179 @@
+import functools
+import hashlib
+import json
+import mmap
+import os
+import pygame
+from config import WIDTH, HEIGHT, MULTIPLIER, WORLD_SCALE
+from game import GameObject, Player, Obstacle, world_size, sprite_cache
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), 'assets')
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '.cache')
+ATLAS_PIXELS = os.path.join(CACHE_DIR, 'atlas.rgba')
+ATLAS_INDEX = os.path.join(CACHE_DIR, 'atlas.json')
+FONTS_DIR = os.path.join(ASSETS_DIR, 'fonts')
+FONT_INDEX = os.path.join(CACHE_DIR, 'fonts.json')
+FONT_EXTENSIONS = ('.ttf', '.otf')
+ATLAS_WIDTH = 1024
+ATLAS_VERSION = 2
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tga')
+SOUND_EXTENSIONS = ('.wav', '.mp3', '.ogg')
+FLIPPED = ('obstacle_chair_side', 'obstacle_table_side', 'button_slider')
+GUI_PREFIXES = ('button_', 'logo')
+
+
+def to_screen_scale(surface: pygame.Surface, scale: int = MULTIPLIER):
+    return pygame.transform.scale(surface, (surface.get_width() * scale, surface.get_height() * scale))
+
+
+def sprite_scale(name: str) -> int:
+    return MULTIPLIER if name.startswith(GUI_PREFIXES) else MULTIPLIER // WORLD_SCALE
+
+
+def scan_assets(extensions: tuple[str, ...], prefix: str = '', *paths: str) -> list[tuple[str, str]]:
+    if prefix != '':
+        prefix += '_'
+    found = []
+    for file in sorted(os.scandir(os.path.join(ASSETS_DIR, *paths)), key=lambda f: f.name):
+        name, ext = os.path.splitext(file.name)
+        if file.is_dir():
+            found.extend(scan_assets(extensions, f'{prefix}{name}', *paths, name))
+        elif ext.lower() in extensions:
+            found.append((f'{prefix}{name}', file.path))
+    return found
+
+
+def hash_assets(images: list[tuple[str, str]]) -> str:
+    digest = hashlib.sha1(f'{ATLAS_VERSION}:{MULTIPLIER}:{WORLD_SCALE}'.encode())
+    for name, path in images:
+        digest.update(name.encode())
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha1(f.read()).digest())
+    return digest.hexdigest()
+
+
+def build_atlas(images: list[tuple[str, str]] | None = None) -> dict:
+    if images is None:
+        images = scan_assets(IMAGE_EXTENSIONS)
+    sprites = {}
+    for name, path in images:
+        sprites[name] = to_screen_scale(pygame.image.load(path), sprite_scale(name))
+
+    width = max(ATLAS_WIDTH, *(sprite.get_width() for sprite in sprites.values()))
+    rects = {}
+    x = y = row = 0
+    for name, sprite in sorted(sprites.items(), key=lambda item: -item[1].get_height()):
+        if x + sprite.get_width() > width:
+            x, y, row = 0, y + row, 0
+        rects[name] = (x, y, sprite.get_width(), sprite.get_height())
+        x += sprite.get_width()
+        row = max(row, sprite.get_height())
+
+    atlas = pygame.Surface((width, y + row), pygame.SRCALPHA)
+    for name, rect in rects.items():
+        atlas.blit(sprites[name], rect[:2])
+    index = {'hash': hash_assets(images), 'size': atlas.get_size(), 'sprites': rects}
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(ATLAS_PIXELS, 'wb') as f:
+        f.write(pygame.image.tostring(atlas, 'RGBA'))
+    with open(ATLAS_INDEX, 'w') as f:
+        json.dump(index, f)
+    return index
+
+
+class Assets(dict[str, pygame.Surface]):
+    def __missing__(self, name: str) -> pygame.Surface:
+        if name.endswith('2') and name[:-1] in FLIPPED:
+            return sprite_cache.get(self[name[:-1]], flip_x=True)
+        raise KeyError(name)
+
+
+def load_assets(assets: Assets) -> None:
+    images = scan_assets(IMAGE_EXTENSIONS)
+    try:
+        with open(ATLAS_INDEX) as f:
+            index = json.load(f)
+        if index['hash'] != hash_assets(images):
+            raise ValueError('atlas is out of date')
+        with open(ATLAS_PIXELS, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as pixels:
+            atlas = pygame.image.frombuffer(pixels, index['size'], 'RGBA').convert_alpha()
+    except (FileNotFoundError, OSError, ValueError, KeyError, pygame.error):
+        index = build_atlas(images)
+        with open(ATLAS_PIXELS, 'rb') as f:
+            atlas = pygame.image.frombuffer(f.read(), index['size'], 'RGBA').convert_alpha()
+    for name, rect in index['sprites'].items():
+        assets[name] = atlas.subsurface(rect)
+
+
+def match_font(name: str, bold: bool = False) -> tuple[str | None, bool]:
+    for ext in FONT_EXTENSIONS:
+        path = os.path.join(FONTS_DIR, f'{name}{"-bold" if bold else ""}{ext}')
+        if os.path.isfile(path):
+            return path, False
+        path = os.path.join(FONTS_DIR, f'{name}{ext}')
+        if os.path.isfile(path):
+            return path, bold
+    path = pygame.font.match_font(name, bold)
+    return path, bold and (path is None or path == pygame.font.match_font(name))
+
+
+@functools.cache
+def font_index() -> dict[str, list]:
+    try:
+        with open(FONT_INDEX) as f:
+            return json.load(f)
+    except (FileNotFoundError, OSError, ValueError):
+        return {}
+
+
+def load_font(name: str, size: int, bold: bool = False) -> pygame.font.Font:
+    index = font_index()
+    key = f'{name}:{bold}'
+    if key not in index or index[key][0] is not None and not os.path.isfile(index[key][0]):
+        index[key] = match_font(name, bold)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(FONT_INDEX, 'w') as f:
+            json.dump(index, f)
+    path, fake_bold = index[key]
+    font = pygame.font.Font(path, size)
+    font.set_bold(fake_bold)
+    return font
+
+
+def build_obstacles(assets: dict[str, pygame.Surface]) -> tuple[tuple[Obstacle, ...], tuple[Obstacle, ...]]:
+    ground_y = HEIGHT - HEIGHT / MULTIPLIER
+
+    def obstacle(x: float, name: str, obs_type: str) -> Obstacle:
+        return Obstacle((x, ground_y - world_size(assets[name])[1]), assets[name], obs_type)
+
+    obstacles = (
+        obstacle(WIDTH + Obstacle.velocity, 'obstacle_chair_side', 'chair'),
+        obstacle(WIDTH + Obstacle.velocity, 'obstacle_chair_side2', 'chair'),
+        obstacle(WIDTH + Obstacle.velocity, 'obstacle_table_side', 'table'),
+        obstacle(WIDTH + Obstacle.velocity, 'obstacle_table_side2', 'table'),
+    )
+    recycle_obs = (
+        obstacle(WIDTH + Obstacle.velocity * 2 * 100, 'bottle_bottle', 'bottle'),
+        obstacle(WIDTH + Obstacle.velocity * 2 * 100, 'bottle_can', 'bottle'),
+        obstacle(WIDTH + Obstacle.velocity * 2 * 100, 'recycle_bin', 'bin'),
+    )
+    return obstacles, recycle_obs
+
+
+@functools.cache
+def ground_image() -> pygame.Surface:
+    grey_box = pygame.Surface((WIDTH / WORLD_SCALE, HEIGHT / MULTIPLIER / WORLD_SCALE))
+    grey_box.fill((125, 125, 125))
+    return grey_box
+
+
+def create_ground() -> GameObject:
+    return GameObject((0, HEIGHT - HEIGHT / MULTIPLIER), ground_image())
+
+
+def create_player(assets: dict[str, pygame.Surface], ground: GameObject, x: float = WIDTH / MULTIPLIER) -> Player:
+    return Player(x, ground.pos.y, assets['player_side'], assets['player_holding'])
+
+
+if __name__ == '__main__':
+    print(f'Wrote {len(build_atlas()["sprites"])} sprites to {ATLAS_PIXELS}')
@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+import os
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', '1')
+
+import pygame
+from config import FPS, NET_HOST, NET_PORT, NET_SNAPSHOT_RATE, rates, difficulty_rates
+from net import Client, Server
+from resources import Assets, load_assets
+
+
+async def bot(client: Client, seconds: float, seed: int) -> None:
+    rng = random.Random(seed)
+    loop = asyncio.get_running_loop()
+    end = loop.time() + seconds
+    while loop.time() < end and not client.closed:
+        client.update()
+        if client.seat is not None and rng.random() < 4 / FPS:
+            client.action()
+        await asyncio.sleep(1 / FPS)
+    client.close()
+
+
+async def run(server: Server, host: str, port: int, bots: int, seconds: float | None) -> list[Client]:
+    serving = asyncio.create_task(server.serve(host, port))
+    if seconds is None:
+        await serving
+        return []
+    await asyncio.sleep(0)
+    loop = asyncio.get_running_loop()
+    clients = []
+    for _ in range(bots):
+        client = Client()
+        await loop.create_datagram_endpoint(lambda: client, remote_addr=(host, port))
+        clients.append(client)
+    await asyncio.gather(*(bot(client, seconds, i) for i, client in enumerate(clients)))
+    server.stop()
+    await serving
+    return clients
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run an authoritative ChairRecycler multiplayer server.')
+    parser.add_argument('--host', default=NET_HOST)
+    parser.add_argument('-p', '--port', type=int, default=NET_PORT)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--snapshot-rate', type=float, default=NET_SNAPSHOT_RATE, help='snapshots per second')
+    parser.add_argument('--difficulty', action='store_true', help='ramp the spawn rates up over time')
+    parser.add_argument('--bots', type=int, default=0, help='connect this many bot clients over localhost')
+    parser.add_argument('-s', '--seconds', type=float, default=10, help='how long the bots play for')
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    assets = Assets()
+    load_assets(assets)
+    server = Server(assets, args.seed, difficulty_rates if args.difficulty else rates, args.snapshot_rate)
+
+    started = time.perf_counter()
+    try:
+        clients = asyncio.run(run(server, args.host, args.port, args.bots, args.seconds if args.bots else None))
+    except KeyboardInterrupt:
+        clients = []
+    elapsed = time.perf_counter() - started
+    for i, client in enumerate(clients):
+        print(f'bot {i}: ' + '  '.join(f'{name} {value:.1f}' for name, value in client.stats().items())
+              + f'  actions {len(client.latencies)}')
+    if clients:
+        print(f'{len(clients)} bots for {elapsed:.1f}s')
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
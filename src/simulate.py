@@ -0,0 +1,76 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from config import rates, difficulty_rates, max_values
+from game import Rate, Replay, ReplayPlayer, RushHourSimulation, Simulation
+from resources import Assets, load_assets, build_obstacles, create_ground, create_player
+
+
+def new_simulation(assets: dict[str, pygame.Surface], seed: int | None = None,
+                   sim_rates: dict[str, Rate] = rates, sim_max_values: dict[str, int] = max_values,
+                   mode: str = 'normal', sim_scores: dict[str, int] | None = None) -> Simulation:
+    obstacles, recycle_obs = build_obstacles(assets)
+    return (RushHourSimulation if mode == 'rush_hour' else Simulation)(
+        create_player(assets, create_ground()), obstacles, recycle_obs, assets['obstacle_chair_side2'],
+        sim_rates, sim_max_values, seed=seed, sim_scores=sim_scores)
+
+
+def run(sim: Simulation, seconds: float, bot: bool = True) -> Simulation:
+    frames = round(seconds / sim.timestep)
+    while sim.frame < frames and not sim.over:
+        sim.step()
+        if bot and sim.colliding is not None:
+            sim.action()
+        sim.events.clear()
+    return sim
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run ChairRecycler sessions without a window.')
+    parser.add_argument('-s', '--seconds', type=float, default=600, help='simulated seconds per session')
+    parser.add_argument('-n', '--sessions', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--idle', action='store_true', help='never press the action keybind')
+    parser.add_argument('--rush-hour', action='store_true', help='run the rush hour mode')
+    parser.add_argument('--difficulty', action='store_true', help='ramp the spawn rates up over time')
+    parser.add_argument('--replay', help='play back a recorded replay file instead')
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    assets = Assets()
+    load_assets(assets)
+
+    if args.replay:
+        replay = Replay.load(args.replay)
+        started = time.perf_counter()
+        sim = ReplayPlayer(replay, lambda r: new_simulation(assets, r.seed, r.rates, r.max_values, r.mode,
+                                                                          r.scores)).run()
+        elapsed = time.perf_counter() - started
+        print(f'name={replay.name!r} seed={sim.seed} time={sim.time:.2f}s score={sim.score} lives={sim.lives} '
+              f'chairs_flipped={sim.chairs_flipped} bottles_recycled={sim.bottles_recycled}')
+        print(f'{sim.time:.0f} simulated seconds in {elapsed:.2f}s ({sim.time / max(elapsed, 1e-9):.0f}x real time)')
+        pygame.quit()
+        return
+
+    simulated = 0
+    started = time.perf_counter()
+    for i in range(args.sessions):
+        sim = new_simulation(assets, args.seed + i, difficulty_rates if args.difficulty else rates,
+                             mode='rush_hour' if args.rush_hour else 'normal')
+        sim = run(sim, args.seconds, not args.idle)
+        simulated += sim.time
+        print(f'seed={args.seed + i} time={sim.time:.2f}s score={sim.score} lives={sim.lives} '
+              f'chairs_flipped={sim.chairs_flipped} bottles_recycled={sim.bottles_recycled}')
+    elapsed = time.perf_counter() - started
+    print(f'{simulated:.0f} simulated seconds in {elapsed:.2f}s ({simulated / elapsed:.0f}x real time)')
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
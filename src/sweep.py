@@ -0,0 +1,119 @@
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from config import rates, max_values, scores
+from game import Obstacle
+from profiler import percentile
+from resources import Assets, load_assets
+from simulate import new_simulation, run
+
+PARAMETERS = {
+    'obstacle': rates['obstacle'],
+    'recycle': rates['recycle'],
+    'chair': max_values['chair'],
+    'bottle': max_values['bottle'],
+    'velocity': Obstacle.velocity,
+    'table_score': scores['table'],
+    'bottle_score': scores['bottle'],
+    'missed_bottle': scores['missed_bottle'],
+}
+COLUMNS = ('games', 'score_mean', 'score_p10', 'score_p50', 'score_p90', 'lives_lost_mean', 'length_mean',
+           'length_p50', 'survived')
+
+assets = Assets()
+
+
+def number(text: str) -> float:
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def init_worker():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    load_assets(assets)
+
+
+def play(task: tuple[tuple[float, ...], int, float]) -> tuple[float, int, float]:
+    values, seed, seconds = task
+    params = dict(zip(PARAMETERS, values))
+    Obstacle.velocity = params['velocity']
+    sim = new_simulation(assets, seed, {'obstacle': params['obstacle'], 'recycle': params['recycle']},
+                         {'chair': params['chair'], 'bottle': params['bottle']},
+                         sim_scores={'table': params['table_score'], 'bottle': params['bottle_score'],
+                                     'missed_bottle': params['missed_bottle']})
+    lives = sim.lives
+    sim = run(sim, seconds)
+    return sim.score, lives - sim.lives, sim.time
+
+
+def summarize(results: list[tuple[float, int, float]], seconds: float) -> dict[str, float]:
+    score = sorted(result[0] for result in results)
+    length = sorted(result[2] for result in results)
+    return {
+        'games': len(results),
+        'score_mean': statistics.fmean(score),
+        'score_p10': percentile(score, 10),
+        'score_p50': percentile(score, 50),
+        'score_p90': percentile(score, 90),
+        'lives_lost_mean': statistics.fmean(result[1] for result in results),
+        'length_mean': statistics.fmean(length),
+        'length_p50': percentile(length, 50),
+        'survived': sum(time >= seconds - 1e-6 for time in length) / len(length),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweep game balance parameters with bot players across cores.')
+    for name, default in PARAMETERS.items():
+        parser.add_argument(f'--{name.replace("_", "-")}', dest=name, type=number, nargs='+', default=[default],
+                            metavar='VALUE', help=f'values to try (default {default})')
+    parser.add_argument('-n', '--seeds', type=int, default=20, help='games per parameter combination')
+    parser.add_argument('-s', '--seconds', type=float, default=600, help='simulated seconds per game')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help='processes, one game each')
+    parser.add_argument('-o', '--output', help='also write the report to this csv file')
+    args = parser.parse_args()
+
+    grid = list(itertools.product(*(getattr(args, name) for name in PARAMETERS)))
+    tasks = [(values, seed, args.seconds) for values in grid for seed in range(args.seeds)]
+    print(f'{len(grid)} combinations x {args.seeds} seeds = {len(tasks)} games on {args.workers} workers')
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, multiprocessing.get_context('spawn'), init_worker) as pool:
+        results = list(pool.map(play, tasks, chunksize=max(1, len(tasks) // (args.workers * 8))))
+    elapsed = time.perf_counter() - started
+
+    rows = []
+    for i, values in enumerate(grid):
+        row = dict(zip(PARAMETERS, values))
+        row.update(summarize(results[i * args.seeds:(i + 1) * args.seeds], args.seconds))
+        rows.append(row)
+
+    header = (*PARAMETERS, *COLUMNS)
+    widths = [max(len(name), 8) for name in header]
+    print('  '.join(name.rjust(width) for name, width in zip(header, widths)))
+    for row in rows:
+        print('  '.join((f'{row[name]:.2f}' if isinstance(row[name], float) else str(row[name])).rjust(width)
+                        for name, width in zip(header, widths)))
+    print(f'{len(tasks)} games in {elapsed:.1f}s ({len(tasks) / elapsed:.1f} games/s)')
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, header)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f'Wrote {len(rows)} rows to {args.output}')
+
+
+if __name__ == '__main__':
+    main()